@@ -5,46 +5,179 @@ Creates an executable using PyInstaller with optimized settings
 """
 
 import os
+import re
 import sys
+import shutil
+import hashlib
+import zipfile
+import importlib.util
 import subprocess
 from pathlib import Path
 
+APP_NAME = "ImageViewerPro_v2.1"
+DIST_DIR = Path("dist")
+APP_DIR = DIST_DIR / APP_NAME
+ZIP_NAME = APP_NAME + ".zip"
+
+# Finished builds are cached here, keyed by a hash of the build inputs
+CACHE_DIR = Path.home() / ".cache" / "imageviewerpro-build"
+CACHE_KEEP = 3  # most recently used builds kept in the cache
+BUILD_INPUTS = ["main.py", "build.py", "requirements.txt", "icon.ico"]
+
+# Packages PyInstaller pulls in through optional imports that the app never
+# uses. Images reach Qt through QImage directly, so PIL.ImageQt goes too.
+EXCLUDED_MODULES = [
+    "tkinter",
+    "matplotlib",
+    "numpy.tests",
+    "PIL.ImageTk",
+    "PIL.ImageQt",
+    "PyQt5.QtWebEngine",
+    "PyQt5.QtWebEngineWidgets",
+    "PyQt5.Qt3DCore",
+    "scipy",
+    "pandas",
+    "IPython",
+    "setuptools",
+]
+
+# Binaries that must stay uncompressed when UPX is used (compressed copies
+# break loading or trigger antivirus false positives on Windows)
+UPX_EXCLUDES = ["vcruntime140.dll", "python3.dll", "Qt5Gui.dll"]
+
+
+def get_build_key():
+    """Hash build inputs together with the Python and installed package versions"""
+    from importlib.metadata import version, PackageNotFoundError
+    
+    digest = hashlib.sha256()
+    for name in BUILD_INPUTS:
+        path = Path(name)
+        if path.exists():
+            digest.update(name.encode())
+            digest.update(path.read_bytes())
+    digest.update(sys.version.encode())
+    
+    # requirements.txt only sets lower bounds - an upgraded package must
+    # not reuse a bundle built against the old one
+    for line in Path("requirements.txt").read_text().splitlines():
+        package = re.split(r"[\s<>=!~;\[]", line.strip(), maxsplit=1)[0]
+        if not package or package.startswith("#"):
+            continue
+        try:
+            installed = version(package)
+        except PackageNotFoundError:
+            installed = "missing"
+        digest.update(f"{package}=={installed}".encode())
+    return digest.hexdigest()
+
+
+def extract_archive(archive: Path, destination: Path):
+    """Unpack a zip keeping POSIX permission bits, which shutil.unpack_archive drops"""
+    with zipfile.ZipFile(archive) as zf:
+        for member in zf.infolist():
+            path = zf.extract(member, destination)
+            mode = member.external_attr >> 16
+            if mode:
+                os.chmod(path, mode & 0o7777)
+
+
+def prune_build_cache(keep: int = CACHE_KEEP):
+    """Delete all but the most recently used cached builds"""
+    try:
+        builds = sorted(CACHE_DIR.glob(f"*-{ZIP_NAME}"), key=lambda path: path.stat().st_mtime,
+                        reverse=True)
+        # Leftovers of interrupted copies go too
+        for path in builds[keep:] + list(CACHE_DIR.glob("*.tmp")):
+            path.unlink()
+    except OSError as e:
+        print(f"⚠️ Could not prune build cache: {e}")
+
+
 def main():
     """Build ImageViewer Pro executable"""
     print("🔨 Building ImageViewer Pro v2.1...")
     
-    # Check if PyInstaller is available
-    try:
-        import PyInstaller
+    # Check if PyInstaller is available without importing it
+    if importlib.util.find_spec("PyInstaller") is not None:
         print("✅ PyInstaller found")
-    except ImportError:
+    else:
         print("❌ PyInstaller not found. Installing...")
-        subprocess.run([sys.executable, "-m", "pip", "install", "pyinstaller"])
+        try:
+            subprocess.run([sys.executable, "-m", "pip", "install", "pyinstaller"], check=True)
+        except subprocess.CalledProcessError as e:
+            print(f"❌ Installation failed: {e}")
+            return 1
+    
+    # Reuse the previous build when nothing relevant has changed
+    build_key = get_build_key()
+    cached_zip = CACHE_DIR / f"{build_key}-{ZIP_NAME}"
+    dist_zip = DIST_DIR / ZIP_NAME
     
-    # Build command
+    if cached_zip.exists():
+        DIST_DIR.mkdir(exist_ok=True)
+        shutil.rmtree(APP_DIR, ignore_errors=True)
+        shutil.copy2(cached_zip, dist_zip)
+        extract_archive(dist_zip, DIST_DIR)
+        os.utime(cached_zip)  # mark as recently used for pruning
+        print("⚡ Sources unchanged - reused cached build")
+        print(f"📁 Application restored to '{APP_DIR}'")
+        return 0
+    
+    # Build command (no --clean so PyInstaller can reuse its own caches).
+    # One-folder mode avoids unpacking the whole bundle to a temp
+    # directory on every launch, which makes startup much faster.
+    icon_args = ["--icon", "icon.ico"] if Path("icon.ico").exists() else []
     build_cmd = [
         "pyinstaller",
-        "--onefile",
+        "--onedir",
+        "--noconfirm",
         "--windowed", 
-        "--name", "ImageViewerPro_v2.1",
-        "--icon", "icon.ico" if Path("icon.ico").exists() else "",
-        "--clean",
+        "--name", APP_NAME,
+        *icon_args,
         "main.py"
     ]
+    for module in EXCLUDED_MODULES:
+        build_cmd += ["--exclude-module", module]
     
-    # Remove empty icon parameter if no icon file
-    build_cmd = [cmd for cmd in build_cmd if cmd]
+    # Compress bundled binaries with UPX when it is installed
+    upx_path = shutil.which("upx")
+    if upx_path:
+        print("✅ UPX found - compressing binaries")
+        build_cmd += ["--upx-dir", os.path.dirname(upx_path)]
+        for binary in UPX_EXCLUDES:
+            build_cmd += ["--upx-exclude", binary]
+    else:
+        build_cmd.append("--noupx")
     
     print(f"🚀 Running: {' '.join(build_cmd)}")
     
+    # Bundle bytecode compiled with -OO (no asserts or docstrings)
+    build_env = {**os.environ, "PYTHONOPTIMIZE": "2"}
+    
     try:
-        result = subprocess.run(build_cmd, check=True)
+        result = subprocess.run(build_cmd, check=True, env=build_env)
         print("✅ Build completed successfully!")
-        print("📁 Executable created in 'dist' directory")
     except subprocess.CalledProcessError as e:
         print(f"❌ Build failed: {e}")
         return 1
     
+    # Ship the application folder as a single archive
+    shutil.make_archive(str(DIST_DIR / APP_NAME), "zip", str(DIST_DIR), APP_NAME)
+    print(f"📁 Application created in '{APP_DIR}'")
+    print(f"📦 Distribution archive: '{dist_zip}'")
+    
+    # Store the fresh archive for the next unchanged build (copy then rename
+    # so an interrupted copy never looks like a finished cache entry)
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        temp_zip = cached_zip.with_suffix(".tmp")
+        shutil.copyfile(dist_zip, temp_zip)
+        os.replace(temp_zip, cached_zip)
+    except OSError as e:
+        print(f"⚠️ Could not cache build: {e}")
+    prune_build_cache()
+    
     return 0
 
 if __name__ == "__main__":
@@ -8,10 +8,15 @@ License: MIT License
 
 import sys
 import os
+import argparse
 import datetime
+import gc
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait as wait_futures
 from pathlib import Path
 from typing import List, Optional, Tuple, Dict, Any
-import io
 
 # Fast imports - no auto-install for better startup speed
 try:
@@ -22,73 +27,535 @@ try:
         QStatusBar, QFrame, QSlider, QSpinBox, QComboBox, QGroupBox,
         QGridLayout, QMessageBox, QProgressBar, QCheckBox
     )
-    from PyQt5.QtCore import Qt, QTimer, QThread, pyqtSignal, QSize, QPoint
+    from PyQt5.QtCore import Qt, QObject, QTimer, QThread, pyqtSignal, QSize, QPoint
     from PyQt5.QtGui import (
-        QPixmap, QIcon, QPainter, QPen, QBrush, QFont, QPalette,
-        QKeySequence, QCursor, QTransform
+        QPixmap, QImage, QIcon, QPainter, QPainterPath, QPen, QBrush, QColor, QFont, QPalette,
+        QKeySequence, QCursor, QTransform, QImageReader
     )
-    from PIL import Image, ImageQt, ExifTags
+    from PIL import Image
     from PIL.ExifTags import TAGS
-    import matplotlib.pyplot as plt
-    from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-    from matplotlib.figure import Figure
-    import numpy as np
 except ImportError as e:
     print(f"❌ Error importing required modules: {e}")
     print("Please install required dependencies: pip install -r requirements.txt")
     sys.exit(1)
 
 
+# Image file extensions shown in the gallery - enhanced with RAW format support
+STANDARD_FORMATS = ('.jpg', '.jpeg', '.png', '.bmp', '.gif', '.tiff', '.tif', '.webp', '.ico')
+RAW_FORMATS = ('.arw', '.cr2', '.cr3', '.nef', '.dng', '.raw', '.orf', '.pef', '.rw2', '.srw', '.x3f')
+SUPPORTED_FORMATS = frozenset(STANDARD_FORMATS + RAW_FORMATS)
+
+# Open dialog name filters, built once from the extension lists
+FILE_DIALOG_FILTER = ";;".join(
+    f"{label} ({' '.join('*' + ext for ext in formats)})"
+    for label, formats in (
+        ("Images", STANDARD_FORMATS + RAW_FORMATS),
+        ("Standard Images", STANDARD_FORMATS),
+        ("RAW Images", RAW_FORMATS),
+    )
+) + ";;All Files (*)"
+
+# Persistent thumbnail cache shared across directory visits and sessions
+THUMBNAIL_CACHE_DIR = Path.home() / ".cache" / "ImageViewerPro" / "thumbs"
+THUMBNAIL_CACHE_LIMIT = 500 * 1024 * 1024  # bytes
+
+
+# Important EXIF tags for the metadata panel, resolved to numeric ids once
+EXIF_LABELS = {
+    'Make': '📱 Camera Make',
+    'Model': '📷 Camera Model',
+    'DateTime': '🕒 Date Taken',
+    'ExposureTime': '⏱️ Exposure',
+    'FNumber': '🔍 Aperture',
+    'ISOSpeedRatings': '🎞️ ISO',
+    'FocalLength': '🎯 Focal Length'
+}
+EXIF_IFD_POINTER = 0x8769
+_TAG_IDS = {name: tag_id for tag_id, name in TAGS.items()}
+EXIF_FIELDS = [(_TAG_IDS[name], label) for name, label in EXIF_LABELS.items() if name in _TAG_IDS]
+
+
+# Shortcut strings parsed into key sequences once at import
+SHORTCUTS = {text: QKeySequence(text) for text in (
+    "Ctrl+Shift+O", "F11", "Ctrl+T", "Ctrl++", "Ctrl+-", "Ctrl+0", "Ctrl+1",
+    "Ctrl+L", "Ctrl+R", "Left", "Right", "Up", "Down", "Space", "Backspace"
+)}
+
+# QApplication options that take a separate value; removed before our own
+# argument parsing so the value is not mistaken for the path to open
+QT_VALUE_OPTIONS = frozenset((
+    "-platform", "-platformpluginpath", "-platformtheme", "-plugin", "-style", "-stylesheet",
+    "-session", "-qwindowgeometry", "-qwindowicon", "-qwindowtitle", "-display", "-geometry",
+    "-title", "-name", "-icon", "-font", "-fn", "-bg", "-background", "-fg", "-foreground",
+    "-btn", "-button", "-visual", "-ncols", "-im", "-inputstyle", "-qmljsdebugger",
+))
+
+# Window theme colors (background, text), applied through the palette so
+# toggling the theme does not re-parse APP_QSS
+DARK_THEME = ('#1e1e1e', '#e0e0e0')
+LIGHT_THEME = ('#f5f5f5', '#333333')
+
+# Styles for the main window widgets, parsed once instead of once per
+# widget; widgets opt in through their object names
+APP_QSS = """
+    QWidget {
+        font-family: 'Segoe UI', Arial, sans-serif;
+    }
+    QSplitter::handle {
+        background-color: #3c3c3c;
+        width: 3px;
+        height: 3px;
+    }
+    QSplitter::handle:hover {
+        background-color: #0d7377;
+    }
+    QGroupBox {
+        font-weight: bold;
+        font-size: 12px;
+        color: #14a085;
+        border: 2px solid #3c3c3c;
+        border-radius: 8px;
+        margin-top: 8px;
+        padding-top: 12px;
+    }
+    QGroupBox::title {
+        subcontrol-origin: margin;
+        left: 12px;
+        padding: 0 8px 0 8px;
+        background-color: #1e1e1e;
+    }
+    QFrame#imageFrame {
+        background-color: #1e1e1e;
+        border: 2px solid #3c3c3c;
+        border-radius: 8px;
+    }
+    QScrollArea#imageScrollArea {
+        border: none;
+        background-color: transparent;
+    }
+    QScrollArea#imageScrollArea QScrollBar:vertical,
+    QScrollArea#imageScrollArea QScrollBar:horizontal {
+        background-color: #2b2b2b;
+        border-radius: 6px;
+        width: 12px;
+        height: 12px;
+    }
+    QScrollArea#imageScrollArea QScrollBar::handle:vertical,
+    QScrollArea#imageScrollArea QScrollBar::handle:horizontal {
+        background-color: #0d7377;
+        border-radius: 6px;
+        min-height: 20px;
+        min-width: 20px;
+    }
+    QScrollArea#imageScrollArea QScrollBar::handle:hover {
+        background-color: #14a085;
+    }
+    QLabel#imageLabel {
+        background-color: #1e1e1e;
+        border: 2px solid #3c3c3c;
+        border-radius: 8px;
+    }
+    QListWidget#thumbnailList {
+        background-color: #1e1e1e;
+        color: #e0e0e0;
+        border: 2px solid #3c3c3c;
+        border-radius: 8px;
+        padding: 8px;
+        outline: none;
+    }
+    QListWidget#thumbnailList QScrollBar {
+        background-color: #1e1e1e;
+        color: #e0e0e0;
+    }
+    QListWidget#thumbnailList::item {
+        background-color: #2b2b2b;
+        border: 2px solid #404040;
+        border-radius: 8px;
+        padding: 4px;
+        margin: 2px;
+    }
+    QListWidget#thumbnailList::item:selected {
+        background-color: #0d7377;
+        border: 2px solid #14a085;
+    }
+    QListWidget#thumbnailList::item:hover {
+        background-color: #3c3c3c;
+        border: 2px solid #5a5a5a;
+    }
+    QTextEdit#metadataView {
+        background-color: #1e1e1e;
+        border: 2px solid #3c3c3c;
+        border-radius: 8px;
+        padding: 8px;
+        color: #e0e0e0;
+        font-size: 11px;
+    }
+    QTextEdit#metadataView QScrollBar:vertical {
+        background-color: #2b2b2b;
+        width: 12px;
+        border-radius: 6px;
+    }
+    QTextEdit#metadataView QScrollBar::handle:vertical {
+        background-color: #0d7377;
+        border-radius: 6px;
+        min-height: 20px;
+    }
+    QTextEdit#metadataView QScrollBar::handle:vertical:hover {
+        background-color: #14a085;
+    }
+    QFrame#controlsFrame {
+        background-color: #2b2b2b;
+        border: 2px solid #3c3c3c;
+        border-radius: 8px;
+        padding: 4px;
+    }
+    QFrame#controlsSeparator {
+        color: #3c3c3c;
+    }
+    QPushButton#controlButton {
+        background-color: #0d7377;
+        color: white;
+        border: 2px solid #14a085;
+        border-radius: 6px;
+        padding: 6px 12px;
+        font-weight: bold;
+        font-size: 11px;
+        min-width: 60px;
+    }
+    QPushButton#controlButton:hover {
+        background-color: #14a085;
+        border: 2px solid #1bb299;
+    }
+    QPushButton#controlButton:pressed {
+        background-color: #0a5a5d;
+    }
+    QStatusBar {
+        background-color: #2b2b2b;
+        color: #e0e0e0;
+        border-top: 2px solid #3c3c3c;
+        padding: 4px;
+        font-size: 11px;
+    }
+    QMenuBar {
+        background-color: #2b2b2b;
+        color: #e0e0e0;
+        border-bottom: 2px solid #3c3c3c;
+        padding: 4px;
+    }
+    QMenuBar::item {
+        padding: 6px 12px;
+        margin: 2px;
+        border-radius: 4px;
+    }
+    QMenuBar::item:selected {
+        background-color: #0d7377;
+    }
+    QMenu {
+        background-color: #2b2b2b;
+        color: #e0e0e0;
+        border: 2px solid #3c3c3c;
+        border-radius: 6px;
+        padding: 4px;
+    }
+    QMenu::item {
+        padding: 8px 20px;
+        border-radius: 4px;
+    }
+    QMenu::item:selected {
+        background-color: #0d7377;
+    }
+"""
+
+
+def make_theme_palette(background: str, text: str) -> QPalette:
+    """Palette using the theme colors for every background and text role"""
+    palette = QPalette()
+    for role in (QPalette.Window, QPalette.Base, QPalette.Button):
+        palette.setColor(role, QColor(background))
+    for role in (QPalette.WindowText, QPalette.Text, QPalette.ButtonText):
+        palette.setColor(role, QColor(text))
+    return palette
+
+
+def strip_qt_options(argv: List[str]) -> List[str]:
+    """Remove QApplication's value-taking options and their values"""
+    args = []
+    skip_value = False
+    for arg in argv:
+        if skip_value:
+            skip_value = False
+        elif arg.startswith('-') and '-' + arg.lstrip('-') in QT_VALUE_OPTIONS:
+            skip_value = True  # Qt accepts both -style and --style
+        else:
+            args.append(arg)
+    return args
+
+
+def format_size(size_bytes: float) -> str:
+    """Format file size with appropriate units"""
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if size_bytes < 1024:
+            return f"{size_bytes:.1f} {unit}"
+        size_bytes /= 1024
+    return f"{size_bytes:.1f} TB"
+
+
+def trim_thumbnail_cache(limit: int = THUMBNAIL_CACHE_LIMIT) -> int:
+    """Delete least recently used cached thumbnails once over the size limit.
+    
+    Returns the bytes left in the cache. Trimming goes down to 90% of the
+    limit so a full cache is not rescanned after every few new thumbnails.
+    """
+    total = 0
+    try:
+        entries = []
+        for sub_dir in os.scandir(THUMBNAIL_CACHE_DIR):
+            if not sub_dir.is_dir():
+                continue
+            for entry in os.scandir(sub_dir.path):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+                
+        if total <= limit:
+            return total
+            
+        # Least recently used first - cache hits touch the mtime, since
+        # atime is not updated on noatime/relatime mounts or on Windows
+        entries.sort()
+        for _, size, path in entries:
+            os.remove(path)
+            total -= size
+            if total <= limit * 9 // 10:
+                break
+    except OSError:
+        pass
+    return total
+
+
+def prewarm_modules():
+    """Import what the first image's info panels need, off the GUI thread"""
+    try:
+        Image.preinit()  # JPEG, PNG, GIF, BMP and PPM plugins
+        import numpy
+    except ImportError:
+        pass
+
+
 class ThumbnailWorker(QThread):
     """Background worker for loading thumbnails asynchronously"""
-    thumbnail_ready = pyqtSignal(str, QPixmap, str)  # path, pixmap, filename
+    thumbnail_ready = pyqtSignal(str, QImage, str)  # path, image, filename
     
-    def __init__(self, image_paths, thumbnail_size=(120, 120)):
+    def __init__(self, thumbnail_size=(120, 120)):
         super().__init__()
-        self.image_paths = image_paths
         self.thumbnail_size = thumbnail_size
         self.should_stop = False
+        self.cache_size = None  # bytes on disk, learned by the first trim
+        self.cache_added = 0  # bytes written since the last trim
+        
+        # Paths waiting to be decoded, most urgent first
+        self.condition = threading.Condition()
+        self.pending = OrderedDict()
+        self.started = set()
+        
+    def request(self, image_paths: List[str]):
+        """Queue paths ahead of everything already pending, keeping their order"""
+        with self.condition:
+            for image_path in reversed(image_paths):
+                if image_path in self.started:
+                    continue
+                self.pending[image_path] = None
+                self.pending.move_to_end(image_path, last=False)
+            self.condition.notify()
+            
+    def clear_pending(self):
+        """Forget queued work (e.g. on directory change) without stopping the thread"""
+        with self.condition:
+            self.pending.clear()
+            self.started.clear()
         
     def run(self):
-        """Generate thumbnails in background with optimized settings"""
-        for image_path in self.image_paths:
-            if self.should_stop:
-                break
+        """Generate requested thumbnails using a pool of decoder threads"""
+        max_workers = min(8, os.cpu_count() or 1)
+        in_flight = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while not self.should_stop:
+                # Keep every decoder busy with the most urgent paths
+                trim_cache = False
+                with self.condition:
+                    while len(in_flight) < max_workers and self.pending:
+                        image_path, _ = self.pending.popitem(last=False)
+                        self.started.add(image_path)
+                        in_flight[executor.submit(self.create_thumbnail, image_path)] = image_path
+                        
+                    if not in_flight:
+                        # Idle - a good moment to keep the on-disk cache bounded
+                        if self.cache_added:
+                            # Only rescan the folder when the running total says it's full
+                            if self.cache_size is None or self.cache_size + self.cache_added > THUMBNAIL_CACHE_LIMIT:
+                                trim_cache = True
+                            else:
+                                self.cache_size += self.cache_added
+                            self.cache_added = 0
+                        else:
+                            self.condition.wait()
+                            
+                if not in_flight:
+                    # Trimming scans the cache folder - don't hold up request() meanwhile
+                    if trim_cache:
+                        self.cache_size = trim_thumbnail_cache()
+                    continue
+                        
+                done, _ = wait_futures(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    image_path = in_flight.pop(future)
+                    qimage = future.result()
+                    if qimage is None or self.should_stop:
+                        continue
+                        
+                    # QPixmap is GUI-thread only - hand over the QImage
+                    filename = os.path.basename(image_path)
+                    self.thumbnail_ready.emit(image_path, qimage, filename)
                 
+    def get_cache_path(self, image_path: str, stat: os.stat_result) -> Path:
+        """Cache file for an image, keyed by path, mtime, size and thumbnail size"""
+        key = f"{os.path.abspath(image_path)}|{stat.st_mtime_ns}|{stat.st_size}|{self.thumbnail_size}"
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        return THUMBNAIL_CACHE_DIR / digest[:2] / f"{digest}.jpg"
+        
+    def create_thumbnail(self, image_path: str) -> Optional[QImage]:
+        """Decode and downscale one image (runs on a pool thread)"""
+        if self.should_stop:
+            return None
+            
+        try:
+            # Quick file existence check
             try:
-                # Quick file existence check
-                if not os.path.exists(image_path):
-                    continue
-                    
-                # Fast thumbnail generation
-                with Image.open(image_path) as image:
-                    # Convert to RGB if necessary for faster processing
-                    if image.mode in ('RGBA', 'P', 'LA'):
-                        image = image.convert('RGB')
-                    
-                    # Use FAST resampling for speed
-                    image.thumbnail(self.thumbnail_size, Image.Resampling.FAST)
-                    
-                    # Quick conversion to bytes using JPEG for speed
-                    byte_array = io.BytesIO()
-                    image.save(byte_array, format='JPEG', quality=75, optimize=True)
-                    byte_array.seek(0)
-                    
-                    # Create QPixmap
-                    pixmap = QPixmap()
-                    pixmap.loadFromData(byte_array.getvalue())
-                    
-                    # Emit signal with result
-                    filename = Path(image_path).name
-                    self.thumbnail_ready.emit(image_path, pixmap, filename)
+                stat = os.stat(image_path)
+            except OSError:
+                return None
+                
+            # Reuse a thumbnail cached by an earlier visit
+            cache_path = self.get_cache_path(image_path, stat)
+            if cache_path.exists():
+                qimage = QImage(str(cache_path))
+                if not qimage.isNull():
+                    try:
+                        os.utime(cache_path)  # mark as recently used for trimming
+                    except OSError:
+                        pass
+                    return qimage
+                
+            # Fast thumbnail generation
+            with Image.open(image_path) as image:
+                # Ask the decoder for a reduced image before any pixels are read
+                # (JPEG decodes straight to 1/2, 1/4 or 1/8 scale; no-op elsewhere)
+                width, height = self.thumbnail_size
+                image.draft('RGB', (width * 2, height * 2))
+                
+                # Palette images cannot be averaged - expand before resizing
+                if image.mode in ('P', '1'):
+                    image = image.convert('RGB')
+                
+                # Use BOX resampling for speed (Pillow has no FAST filter)
+                image.thumbnail(self.thumbnail_size, Image.Resampling.BOX)
+                
+                # Convert the small result only - cheaper than converting full size
+                if image.mode != 'RGB':
+                    image = image.convert('RGB')
                     
-            except Exception:
-                # Skip problematic images silently for better performance
-                continue
+                # Wrap raw RGB bytes directly - no JPEG encode/decode round-trip
+                data = image.tobytes()
+                qimage = QImage(data, image.width, image.height,
+                                image.width * 3, QImage.Format_RGB888)
+                
+                # Store for the next visit (write then rename so readers never see partial files)
+                try:
+                    cache_path.parent.mkdir(parents=True, exist_ok=True)
+                    temp_path = cache_path.with_suffix('.tmp')
+                    image.save(temp_path, format='JPEG', quality=90)
+                    size = temp_path.stat().st_size
+                    os.replace(temp_path, cache_path)
+                    with self.condition:
+                        self.cache_added += size
+                except OSError:
+                    pass
                 
+                # Detach from the temporary byte buffer
+                return qimage.copy()
+                
+        except Exception:
+            # Skip problematic images silently for better performance
+            return None
+            
     def stop(self):
         """Stop the worker"""
-        self.should_stop = True
+        with self.condition:
+            self.should_stop = True
+            self.condition.notify()
+
+
+class ImageLoader(QObject):
+    """Decodes full-size images on worker threads"""
+    image_loaded = pyqtSignal(str, QImage, int)  # path, image, generation
+    preview_loaded = pyqtSignal(str, QImage, int)  # path, reduced image, generation
+    
+    PREFETCH = -1  # generation reported for prefetched images
+    
+    def __init__(self):
+        super().__init__()
+        self.executor = ThreadPoolExecutor(max_workers=2)
+        self.load_futures = []
+        # Prefetching has its own thread so it never delays a requested image
+        self.prefetch_executor = ThreadPoolExecutor(max_workers=1)
+        self.prefetch_futures = []
+        
+    def load(self, image_path: str, generation: int, preview_size: Optional[QSize] = None):
+        """Queue an image for decoding, with a quick reduced JPEG decode first"""
+        # Decodes for superseded navigations that have not started are dropped
+        for future in self.load_futures:
+            future.cancel()
+        self.load_futures = []
+        if preview_size is not None:
+            self.load_futures.append(
+                self.executor.submit(self.decode_preview, image_path, generation, preview_size))
+        self.load_futures.append(self.executor.submit(self.decode, image_path, generation))
+        
+    def prefetch(self, image_paths: List[str]):
+        """Replace queued prefetches with the given images"""
+        for future in self.prefetch_futures:
+            future.cancel()
+        self.prefetch_futures = [
+            self.prefetch_executor.submit(self.decode, path, self.PREFETCH)
+            for path in image_paths
+        ]
+        
+    def decode(self, image_path: str, generation: int):
+        """Decode into a QImage, which unlike QPixmap is safe off the GUI thread"""
+        self.image_loaded.emit(image_path, QImage(image_path), generation)
+        
+    def decode_preview(self, image_path: str, generation: int, preview_size: QSize):
+        """Decode a large JPEG at reduced scale, which libjpeg does in a fraction of the time"""
+        reader = QImageReader(image_path)
+        size = reader.size()
+        if reader.format() != b'jpeg' or not size.isValid():
+            return
+        if size.width() < 2 * preview_size.width() and size.height() < 2 * preview_size.height():
+            return
+            
+        reader.setScaledSize(size.scaled(preview_size, Qt.KeepAspectRatio))
+        image = reader.read()
+        if not image.isNull():
+            self.preview_loaded.emit(image_path, image, generation)
+        
+    def stop(self):
+        """Drop queued decodes"""
+        # Every submission is tracked, so this does what shutdown(cancel_futures=True)
+        # does without needing Python 3.9
+        for future in self.load_futures + self.prefetch_futures:
+            future.cancel()
+        self.executor.shutdown(wait=False)
+        self.prefetch_executor.shutdown(wait=False)
 
 
 class ImageLabel(QLabel):
@@ -97,50 +564,101 @@ class ImageLabel(QLabel):
     def __init__(self):
         super().__init__()
         self.original_pixmap = None
+        self.display_pixmap = None  # original_pixmap pre-scaled by display_ratio
+        self.display_ratio = 1.0
+        self.rotated_pixmap = None  # rotated_source rotated by rotated_angle
+        self.rotated_source = None
+        self.rotated_angle = 0
         self.scale_factor = 1.0
         self.rotation_angle = 0
         self.dragging = False
         self.last_pan_point = QPoint()
         self.scroll_area = None
         
+        # Wheel zoom renders with fast scaling, then once smoothly when it settles
+        self.smooth_timer = QTimer(self)
+        self.smooth_timer.setSingleShot(True)
+        self.smooth_timer.setInterval(120)
+        self.smooth_timer.timeout.connect(self.update_display)
+        
+        # Wheel ticks arriving within one frame are applied as a single zoom
+        self.pending_zoom = 1.0
+        self.pending_zoom_pos = QPoint()
+        self.zoom_timer = QTimer(self)
+        self.zoom_timer.setSingleShot(True)
+        self.zoom_timer.setInterval(16)
+        self.zoom_timer.timeout.connect(self.apply_pending_zoom)
+        
         self.setAlignment(Qt.AlignCenter)
         self.setMinimumSize(100, 100)
-        self.setStyleSheet("""
-            QLabel {
-                background-color: #1e1e1e;
-                border: 2px solid #3c3c3c;
-                border-radius: 8px;
-            }
-        """)
+        self.setObjectName("imageLabel")  # styled by APP_QSS
         
     def set_scroll_area(self, scroll_area):
         """Set the parent scroll area for panning"""
         self.scroll_area = scroll_area
         
-    def set_image(self, pixmap):
-        """Set image with fast display"""
+    def set_image(self, pixmap, fit=False):
+        """Set image with fast display, optionally fitted to the window in the same render"""
         self.original_pixmap = pixmap
-        self.scale_factor = 1.0
+        self.pending_zoom = 1.0
+        self.display_pixmap = None
+        self.display_ratio = 1.0
+        self.rotated_pixmap = None
+        self.rotated_source = None
         self.rotation_angle = 0
+        self.scale_factor = self.get_fit_scale() if fit else 1.0
         self.update_display()
         
-    def update_display(self):
+    def get_source_pixmap(self):
+        """Return the smallest cached pixmap covering the zoom and its scale"""
+        if self.display_pixmap is not None and self.scale_factor <= self.display_ratio:
+            return self.display_pixmap, self.display_ratio
+        if not self.scroll_area:
+            return self.original_pixmap, 1.0
+            
+        # Large images are scaled once to twice the viewport; zooming below
+        # that works from the small copy instead of the full resolution
+        viewport_size = self.scroll_area.viewport().size()
+        pixmap_size = self.original_pixmap.size()
+        ratio = min(2 * viewport_size.width() / pixmap_size.width(),
+                    2 * viewport_size.height() / pixmap_size.height())
+        if ratio >= 1.0 or self.scale_factor > ratio:
+            return self.original_pixmap, 1.0
+            
+        self.display_pixmap = self.original_pixmap.scaled(
+            pixmap_size * ratio, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        self.display_ratio = ratio
+        return self.display_pixmap, ratio
+        
+    def update_display(self, transformation=Qt.SmoothTransformation):
         """Update image display with current transformations"""
         if not self.original_pixmap:
             return
             
-        # Apply rotation if needed
-        if self.rotation_angle != 0:
+        # A smooth render supersedes any pending one
+        if transformation == Qt.SmoothTransformation:
+            self.smooth_timer.stop()
+            
+        source_pixmap, source_ratio = self.get_source_pixmap()
+        
+        # Apply rotation if needed (cached - zooming does not change it)
+        if self.rotation_angle == 0:
+            rotated_pixmap = source_pixmap
+        elif (self.rotated_pixmap is not None and self.rotated_source is source_pixmap
+              and self.rotated_angle == self.rotation_angle):
+            rotated_pixmap = self.rotated_pixmap
+        else:
             transform = QTransform()
             transform.rotate(self.rotation_angle)
-            rotated_pixmap = self.original_pixmap.transformed(transform, Qt.SmoothTransformation)
-        else:
-            rotated_pixmap = self.original_pixmap
-        
-        # Apply scaling
-        if self.scale_factor != 1.0:
-            scaled_size = rotated_pixmap.size() * self.scale_factor
-            scaled_pixmap = rotated_pixmap.scaled(scaled_size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+            rotated_pixmap = source_pixmap.transformed(transform, Qt.SmoothTransformation)
+            self.rotated_pixmap = rotated_pixmap
+            self.rotated_source = source_pixmap
+            self.rotated_angle = self.rotation_angle
+        
+        # Apply scaling relative to the chosen source
+        if self.scale_factor != source_ratio:
+            scaled_size = rotated_pixmap.size() * (self.scale_factor / source_ratio)
+            scaled_pixmap = rotated_pixmap.scaled(scaled_size, Qt.KeepAspectRatio, transformation)
         else:
             scaled_pixmap = rotated_pixmap
         
@@ -153,20 +671,31 @@ class ImageLabel(QLabel):
         if not self.original_pixmap:
             return
             
+        # Accumulate until the next frame
+        zoom_in = event.angleDelta().y() > 0
+        self.pending_zoom *= 1.25 if zoom_in else 0.8
+        self.pending_zoom_pos = event.pos()
+        if not self.zoom_timer.isActive():
+            self.zoom_timer.start()
+            
+    def apply_pending_zoom(self):
+        """Apply the accumulated wheel zoom around the last cursor position"""
+        zoom_factor = self.pending_zoom
+        self.pending_zoom = 1.0
+        if not self.original_pixmap:
+            return
+            
         # Store old scale and cursor position
         old_scale = self.scale_factor
-        cursor_pos = event.pos()
-        
-        # Calculate zoom
-        zoom_in = event.angleDelta().y() > 0
-        zoom_factor = 1.25 if zoom_in else 0.8
+        cursor_pos = self.pending_zoom_pos
         
         new_scale = self.scale_factor * zoom_factor
         new_scale = max(0.1, min(new_scale, 10.0))  # Limit zoom range
         
         if new_scale != self.scale_factor:
             self.scale_factor = new_scale
-            self.update_display()
+            self.update_display(Qt.FastTransformation)
+            self.smooth_timer.start()
             
             # Adjust scroll position to zoom at cursor
             if self.scroll_area and old_scale != self.scale_factor:
@@ -196,8 +725,13 @@ class ImageLabel(QLabel):
             h_bar = self.scroll_area.horizontalScrollBar()
             v_bar = self.scroll_area.verticalScrollBar()
             
+            # Move both scrollbars, then repaint once
+            viewport = self.scroll_area.viewport()
+            viewport.setUpdatesEnabled(False)
             h_bar.setValue(h_bar.value() - delta.x())
             v_bar.setValue(v_bar.value() - delta.y())
+            viewport.setUpdatesEnabled(True)
+            viewport.update()
             
             self.last_pan_point = event.pos()
             
@@ -219,10 +753,10 @@ class ImageLabel(QLabel):
         self.scale_factor = max(self.scale_factor, 0.1)
         self.update_display()
         
-    def zoom_fit(self):
-        """Fit image to window"""
+    def get_fit_scale(self):
+        """Scale that fits the image into the viewport without enlarging it"""
         if not self.original_pixmap or not self.scroll_area:
-            return
+            return 1.0
             
         viewport_size = self.scroll_area.viewport().size()
         pixmap_size = self.original_pixmap.size()
@@ -230,7 +764,14 @@ class ImageLabel(QLabel):
         scale_x = viewport_size.width() / pixmap_size.width()
         scale_y = viewport_size.height() / pixmap_size.height()
         
-        self.scale_factor = min(scale_x, scale_y, 1.0)
+        return min(scale_x, scale_y, 1.0)
+        
+    def zoom_fit(self):
+        """Fit image to window"""
+        if not self.original_pixmap or not self.scroll_area:
+            return
+            
+        self.scale_factor = self.get_fit_scale()
         self.update_display()
         
     def zoom_actual(self):
@@ -252,6 +793,9 @@ class ImageLabel(QLabel):
 class BeautifulThumbnailWidget(QListWidget):
     """High-performance thumbnail widget with beautiful styling"""
     
+    # Thumbnails decoded ahead of and behind the visible rows
+    PREFETCH_COUNT = 20
+    
     def __init__(self):
         super().__init__()
         self.setViewMode(QListWidget.IconMode)
@@ -261,39 +805,30 @@ class BeautifulThumbnailWidget(QListWidget):
         self.setUniformItemSizes(True)
         self.setMovement(QListWidget.Static)
         
-        # Beautiful styling
-        self.setStyleSheet("""
-            QListWidget {
-                background-color: #1e1e1e;
-                border: 2px solid #3c3c3c;
-                border-radius: 8px;
-                padding: 8px;
-                outline: none;
-            }
-            QListWidget::item {
-                background-color: #2b2b2b;
-                border: 2px solid #404040;
-                border-radius: 8px;
-                padding: 4px;
-                margin: 2px;
-            }
-            QListWidget::item:selected {
-                background-color: #0d7377;
-                border: 2px solid #14a085;
-            }
-            QListWidget::item:hover {
-                background-color: #3c3c3c;
-                border: 2px solid #5a5a5a;
-            }
-        """)
+        self.setObjectName("thumbnailList")  # styled by APP_QSS
         
         # Store paths and cache
         self.image_paths = []
+        self.items_by_path: Dict[str, QListWidgetItem] = {}
+        self.index_by_path: Dict[str, int] = {}
+        self.file_sizes = {}
         self.thumbnail_cache = {}
         self.thumbnail_worker = None
         
         # Create beautiful placeholder
         self.placeholder_pixmap = self.create_placeholder()
+        self.placeholder_icon = QIcon(self.placeholder_pixmap)  # shared by all items
+        
+        # Decode only what scrolls into view (coalesced while scrolling)
+        self.visible_timer = QTimer(self)
+        self.visible_timer.setSingleShot(True)
+        self.visible_timer.setInterval(50)
+        self.visible_timer.timeout.connect(self.request_visible_thumbnails)
+        self.verticalScrollBar().valueChanged.connect(self.schedule_visible_thumbnails)
+        
+        # Tooltips are built when the pointer first reaches an item
+        self.setMouseTracking(True)
+        self.itemEntered.connect(self.set_item_tooltip)
         
     def create_placeholder(self):
         """Create beautiful loading placeholder"""
@@ -326,32 +861,32 @@ class BeautifulThumbnailWidget(QListWidget):
         return pixmap
         
     def load_directory(self, directory: str):
-        """Load directory with async thumbnails"""        # Stop existing worker
-        if self.thumbnail_worker and self.thumbnail_worker.isRunning():
-            self.thumbnail_worker.stop()
-            self.thumbnail_worker.wait()
+        """Load directory with async thumbnails"""
+        # Drop work queued for the previous directory - the worker thread is reused
+        if self.thumbnail_worker:
+            self.thumbnail_worker.clear_pending()
             
         self.clear()
         self.image_paths.clear()
+        self.items_by_path.clear()
+        self.index_by_path.clear()
+        self.file_sizes.clear()
         self.thumbnail_cache.clear()
         
-        # Fast file scanning - Enhanced with RAW format support
-        supported_formats = {
-            # Standard formats
-            '.jpg', '.jpeg', '.png', '.bmp', '.gif', '.tiff', '.tif', '.webp', '.ico',
-            # RAW camera formats
-            '.arw', '.cr2', '.cr3', '.nef', '.dng', '.raw', '.orf', '.pef', '.rw2', '.srw', '.x3f'
-        }
-        
         try:
-            directory_path = Path(directory)
             image_files = []
             
-            # Quick scan for image files
-            for file_path in directory_path.iterdir():
-                if (file_path.suffix.lower() in supported_formats and 
-                    file_path.is_file() and file_path.stat().st_size > 0):
-                    image_files.append(str(file_path))
+            # Quick scan for image files - one stat per file, size kept for tooltips
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    name = entry.name
+                    dot = name.rfind('.')
+                    if (dot > 0 and name[dot:].lower() in SUPPORTED_FORMATS and
+                        entry.is_file()):
+                        size = entry.stat().st_size
+                        if size > 0:
+                            image_files.append(entry.path)
+                            self.file_sizes[entry.path] = size
                     
             if not image_files:
                 return
@@ -361,43 +896,80 @@ class BeautifulThumbnailWidget(QListWidget):
             self.image_paths = image_files
             
             # Create placeholder items immediately
-            for image_path in image_files:
+            for index, image_path in enumerate(image_files):
                 item = QListWidgetItem()
-                item.setIcon(QIcon(self.placeholder_pixmap))
-                item.setText(Path(image_path).name)
-                item.setToolTip(f"📁 {Path(image_path).name}\n📏 {self.get_file_size(image_path)}")
+                item.setIcon(self.placeholder_icon)
+                item.setText(os.path.basename(image_path))
+                item.setData(Qt.UserRole, image_path)
                 self.addItem(item)
+                self.items_by_path[image_path] = item
+                self.index_by_path[image_path] = index
             
-            # Start async thumbnail loading
-            self.thumbnail_worker = ThumbnailWorker(image_files)
-            self.thumbnail_worker.thumbnail_ready.connect(self.on_thumbnail_ready)
-            self.thumbnail_worker.start()
+            # Start async thumbnail loading for the rows that become visible
+            if self.thumbnail_worker is None:
+                self.thumbnail_worker = ThumbnailWorker()
+                self.thumbnail_worker.thumbnail_ready.connect(self.on_thumbnail_ready)
+                self.thumbnail_worker.start()
+            QTimer.singleShot(0, self.request_visible_thumbnails)
             
         except Exception as e:
             print(f"Error loading directory: {e}")
             
-    def get_file_size(self, file_path):
-        """Get formatted file size"""
-        try:
-            size = os.path.getsize(file_path)
-            for unit in ['B', 'KB', 'MB', 'GB']:
-                if size < 1024:
-                    return f"{size:.1f} {unit}"
-                size /= 1024
-            return f"{size:.1f} TB"
-        except:
-            return "Unknown"
+    def resizeEvent(self, event):
+        """More rows may fit after a resize"""
+        super().resizeEvent(event)
+        self.schedule_visible_thumbnails()
+        
+    def schedule_visible_thumbnails(self):
+        """Request visible thumbnails once scrolling or resizing settles"""
+        self.visible_timer.start()
+        
+    def request_visible_thumbnails(self):
+        """Queue thumbnails for visible items first, then nearby ones"""
+        count = self.count()
+        if not self.thumbnail_worker or count == 0:
+            return
+            
+        # Items are laid out in reading order, so binary search the first visible row
+        viewport_height = self.viewport().height()
+        low, high = 0, count - 1
+        while low < high:
+            middle = (low + high) // 2
+            if self.visualItemRect(self.item(middle)).bottom() < 0:
+                low = middle + 1
+            else:
+                high = middle
+        first = low
+        last = first
+        while last + 1 < count and self.visualItemRect(self.item(last + 1)).top() < viewport_height:
+            last += 1
+            
+        start = max(0, first - self.PREFETCH_COUNT)
+        end = min(count, last + 1 + self.PREFETCH_COUNT)
+        self.thumbnail_worker.request(
+            self.image_paths[first:last + 1] +
+            self.image_paths[last + 1:end] +
+            self.image_paths[start:first]
+        )
             
-    def on_thumbnail_ready(self, image_path: str, pixmap: QPixmap, filename: str):
+    def set_item_tooltip(self, item):
+        """Fill in the tooltip of a hovered item from the cached file size"""
+        if item.toolTip():
+            return
+        row = self.row(item)
+        if 0 <= row < len(self.image_paths):
+            image_path = self.image_paths[row]
+            item.setToolTip(f"📁 {item.text()}\n📏 {format_size(self.file_sizes[image_path])}")
+            
+    def on_thumbnail_ready(self, image_path: str, image: QImage, filename: str):
         """Update item with loaded thumbnail"""
         try:
-            # Find and update item
-            for i in range(self.count()):
-                item = self.item(i)
-                if item.toolTip().endswith(Path(image_path).name):
-                    item.setIcon(QIcon(pixmap))
-                    self.thumbnail_cache[image_path] = pixmap
-                    break
+            # Direct lookup - results for a previous directory are ignored
+            item = self.items_by_path.get(image_path)
+            if item is not None:
+                pixmap = QPixmap.fromImage(image)
+                item.setIcon(QIcon(pixmap))
+                self.thumbnail_cache[image_path] = pixmap
         except Exception:
             pass  # Ignore errors for performance
             
@@ -411,37 +983,19 @@ class BeautifulThumbnailWidget(QListWidget):
 class BeautifulMetadataWidget(QTextEdit):
     """Beautiful metadata display widget"""
     
+    CACHE_SIZE = 64
+    
     def __init__(self):
         super().__init__()
         self.setReadOnly(True)
         self.setMaximumHeight(300)
+        self.html_cache = OrderedDict()  # (path, mtime, size) -> html
         
-        # Beautiful styling
-        self.setStyleSheet("""
-            QTextEdit {
-                background-color: #1e1e1e;
-                border: 2px solid #3c3c3c;
-                border-radius: 8px;
-                padding: 8px;
-                color: #e0e0e0;
-                font-family: 'Segoe UI', Arial, sans-serif;
-                font-size: 11px;
-                line-height: 1.4;
-            }
-            QScrollBar:vertical {
-                background-color: #2b2b2b;
-                width: 12px;
-                border-radius: 6px;
-            }
-            QScrollBar::handle:vertical {
-                background-color: #0d7377;
-                border-radius: 6px;
-                min-height: 20px;
-            }
-            QScrollBar::handle:vertical:hover {
-                background-color: #14a085;
-            }
-        """)
+        self.setObjectName("metadataView")  # styled by APP_QSS
+        
+    def clear_cache(self):
+        """Forget metadata of previously shown files"""
+        self.html_cache.clear()
         
     def display_metadata(self, image_path: str):
         """Display comprehensive metadata with beautiful formatting"""
@@ -449,6 +1003,14 @@ class BeautifulMetadataWidget(QTextEdit):
             file_path = Path(image_path)
             file_stat = file_path.stat()
             
+            # Revisited files skip EXIF parsing until they change on disk
+            cache_key = (image_path, file_stat.st_mtime_ns, file_stat.st_size)
+            cached_html = self.html_cache.get(cache_key)
+            if cached_html is not None:
+                self.html_cache.move_to_end(cache_key)
+                self.setHtml(cached_html)
+                return
+            
             # Enhanced metadata with icons and formatting
             metadata_html = f"""
             <div style="color: #e0e0e0; line-height: 1.6;">
@@ -458,7 +1020,7 @@ class BeautifulMetadataWidget(QTextEdit):
                 
                 <table style="width: 100%; border-spacing: 0;">
                     <tr><td style="color: #888; padding: 2px 8px 2px 0;">📏 Size:</td>
-                        <td style="color: #e0e0e0; padding: 2px 0;">{self.format_size(file_stat.st_size)}</td></tr>
+                        <td style="color: #e0e0e0; padding: 2px 0;">{format_size(file_stat.st_size)}</td></tr>
                     <tr><td style="color: #888; padding: 2px 8px 2px 0;">📅 Modified:</td>
                         <td style="color: #e0e0e0; padding: 2px 0;">{datetime.datetime.fromtimestamp(file_stat.st_mtime).strftime('%Y-%m-%d %H:%M:%S')}</td></tr>
                     <tr><td style="color: #888; padding: 2px 8px 2px 0;">📂 Path:</td>
@@ -492,38 +1054,32 @@ class BeautifulMetadataWidget(QTextEdit):
                     
                     metadata_html += "</table>"
                     
-                    # EXIF data
-                    exif_data = img._getexif() if hasattr(img, '_getexif') else None
-                    if exif_data:
-                        metadata_html += """
+                    # EXIF data - header parsing only, pixel data is never decoded.
+                    # Exposure settings live in the Exif sub-IFD, camera info in IFD0.
+                    exif = img.getexif()
+                    exif_data = {**exif, **exif.get_ifd(EXIF_IFD_POINTER)} if exif else {}
+                    
+                    # Look up only the important tags by id
+                    camera_rows = ""
+                    for tag_id, icon_name in EXIF_FIELDS:
+                        value = exif_data.get(tag_id)
+                        if value is not None:
+                            if isinstance(value, tuple) and len(value) == 2:
+                                value = f"{value[0]}/{value[1]}"
+                            camera_rows += f"""
+                            <tr><td style="color: #888; padding: 2px 8px 2px 0;">{icon_name}:</td>
+                                <td style="color: #e0e0e0; padding: 2px 0;">{str(value)[:50]}</td></tr>
+                            """
+                    
+                    # TIFF-based files always carry tags, but not necessarily camera ones
+                    if camera_rows:
+                        metadata_html += f"""
                         <h4 style="color: #14a085; margin: 16px 0 8px 0;">📷 Camera Info</h4>
                         <table style="width: 100%; border-spacing: 0;">
+                        {camera_rows}
+                        </table>
                         """
                         
-                        # Important EXIF tags
-                        important_tags = {
-                            'Make': '📱 Camera Make',
-                            'Model': '📷 Camera Model',
-                            'DateTime': '🕒 Date Taken',
-                            'ExposureTime': '⏱️ Exposure',
-                            'FNumber': '🔍 Aperture',
-                            'ISOSpeedRatings': '🎞️ ISO',
-                            'FocalLength': '🎯 Focal Length'
-                        }
-                        
-                        for tag_id, value in exif_data.items():
-                            tag = TAGS.get(tag_id, tag_id)
-                            if tag in important_tags:
-                                icon_name = important_tags[tag]
-                                if isinstance(value, tuple) and len(value) == 2:
-                                    value = f"{value[0]}/{value[1]}"
-                                metadata_html += f"""
-                                <tr><td style="color: #888; padding: 2px 8px 2px 0;">{icon_name}:</td>
-                                    <td style="color: #e0e0e0; padding: 2px 0;">{str(value)[:50]}</td></tr>
-                                """
-                        
-                        metadata_html += "</table>"
-                        
             except Exception:
                 metadata_html += """
                 <p style="color: #ff6b6b; margin-top: 12px;">
@@ -532,6 +1088,9 @@ class BeautifulMetadataWidget(QTextEdit):
                 """
                 
             metadata_html += "</div>"
+            self.html_cache[cache_key] = metadata_html
+            if len(self.html_cache) > self.CACHE_SIZE:
+                self.html_cache.popitem(last=False)
             self.setHtml(metadata_html)
             
         except Exception as e:
@@ -541,106 +1100,166 @@ class BeautifulMetadataWidget(QTextEdit):
                 <p>{str(e)}</p>
             </div>
             """)
-            
-    def format_size(self, size_bytes):
-        """Format file size with appropriate units"""
-        for unit in ['B', 'KB', 'MB', 'GB']:
-            if size_bytes < 1024:
-                return f"{size_bytes:.1f} {unit}"
-            size_bytes /= 1024
-        return f"{size_bytes:.1f} TB"
 
 
 class BeautifulHistogramWidget(QWidget):
-    """Beautiful histogram widget with enhanced styling"""
+    """Beautiful histogram widget drawn directly with QPainter"""
+    
+    BIN_COUNT = 64
+    CACHE_SIZE = 64
+    CHANNEL_COLORS = [
+        (QColor(255, 68, 68, 178), 'Red'),
+        (QColor(68, 255, 68, 178), 'Green'),
+        (QColor(68, 68, 255, 178), 'Blue'),
+    ]
     
     def __init__(self):
         super().__init__()
         self.setMaximumHeight(200)
+        self.setMinimumHeight(120)
         self.current_image = None
+        self.histograms = None  # (3, BIN_COUNT) array scaled to 0..1
+        self.error_message = None
+        self.histogram_cache = OrderedDict()  # (path, mtime, size) -> histograms
         
-        # Enhanced matplotlib setup
-        plt.style.use('dark_background')
-        self.figure = Figure(figsize=(5, 2.5), dpi=100, facecolor='#1e1e1e')
-        self.canvas = FigureCanvas(self.figure)
-        self.canvas.setStyleSheet("""
-            QWidget {
-                background-color: #1e1e1e;
-                border: 2px solid #3c3c3c;
-                border-radius: 8px;
-            }
-        """)
-        
-        layout = QVBoxLayout(self)
-        layout.addWidget(self.canvas)
-        layout.setContentsMargins(0, 0, 0, 0)
+    def clear_cache(self):
+        """Forget histograms of previously shown files"""
+        self.histogram_cache.clear()
         
     def set_image(self, image_path: str):
         """Set image for histogram with beautiful visualization"""
         try:
-            # Load and process image
-            with Image.open(image_path) as img:
-                # Convert to RGB for consistent processing
-                if img.mode != 'RGB':
-                    img = img.convert('RGB')
-                
-                # Sample image if too large for speed
-                if img.width * img.height > 1000000:  # 1MP
-                    img.thumbnail((800, 600), Image.Resampling.FAST)
-                
-                # Create beautiful histogram
-                self.figure.clear()
-                self.figure.patch.set_facecolor('#1e1e1e')
-                
-                ax = self.figure.add_subplot(111, facecolor='#1e1e1e')
-                
-                # Convert to numpy array
-                data = np.array(img)
-                
-                # Create RGB histogram with beautiful styling
-                colors = ['#ff4444', '#44ff44', '#4444ff']
-                labels = ['Red', 'Green', 'Blue']
-                
-                for i, (color, label) in enumerate(zip(colors, labels)):
-                    ax.hist(data[:,:,i].flatten(), bins=64, color=color, alpha=0.7, 
-                           density=True, label=label, linewidth=0)
-                
-                # Beautiful styling
-                ax.set_xlim(0, 255)
-                ax.set_title('🎨 RGB Color Histogram', fontsize=12, color='#14a085', pad=10)
-                ax.set_xlabel('Pixel Intensity', fontsize=10, color='#e0e0e0')
-                ax.set_ylabel('Frequency', fontsize=10, color='#e0e0e0')
-                
-                # Style the axes
-                ax.tick_params(colors='#888888', labelsize=8)
-                ax.spines['bottom'].set_color('#3c3c3c')
-                ax.spines['top'].set_color('#3c3c3c')
-                ax.spines['right'].set_color('#3c3c3c')
-                ax.spines['left'].set_color('#3c3c3c')
-                
-                # Add legend
-                ax.legend(loc='upper right', fontsize=8, framealpha=0.8, 
-                         facecolor='#2b2b2b', edgecolor='#3c3c3c')
-                
-                # Tight layout
-                self.figure.tight_layout(pad=0.5)
-                self.canvas.draw()
+            # Revisited files are not decoded again until they change on disk
+            file_stat = os.stat(image_path)
+            cache_key = (image_path, file_stat.st_mtime_ns, file_stat.st_size)
+            histograms = self.histogram_cache.get(cache_key)
+            if histograms is None:
+                histograms = self.compute_histograms(image_path)
+                self.histogram_cache[cache_key] = histograms
+                if len(self.histogram_cache) > self.CACHE_SIZE:
+                    self.histogram_cache.popitem(last=False)
+            else:
+                self.histogram_cache.move_to_end(cache_key)
                 
+            self.histograms = histograms
+            self.error_message = None
+            
         except Exception:
             # Clear on error with message
-            self.figure.clear()
-            ax = self.figure.add_subplot(111, facecolor='#1e1e1e')
-            ax.text(0.5, 0.5, '⚠️ Cannot generate histogram', 
-                   horizontalalignment='center', verticalalignment='center',
-                   transform=ax.transAxes, fontsize=12, color='#ff6b6b')
-            ax.set_xticks([])
-            ax.set_yticks([])
-            self.canvas.draw()
+            self.histograms = None
+            self.error_message = '⚠️ Cannot generate histogram'
+            
+        self.update()
+        
+    def compute_histograms(self, image_path: str):
+        """Read per-channel histograms scaled to 0..1"""
+        # numpy is only needed here - keep it out of startup
+        import numpy as np
+        
+        # Load and process image
+        with Image.open(image_path) as img:
+            # JPEGs decode straight at a reduced DCT scale; the display
+            # decode is the only full-resolution one
+            img.draft('RGB', (800, 600))
+            
+            # RGB, RGBA and grayscale are counted as-is; other modes
+            # are converted, after sampling when Pillow can resample them
+            if img.mode not in ('RGB', 'RGBA', 'L', 'P'):
+                img = img.convert('RGB')
+
+            # Sample image if too large for speed
+            if img.width * img.height > 1000000:  # 1MP
+                img.thumbnail((800, 600), Image.Resampling.BOX)
+
+            if img.mode == 'P':
+                img = img.convert('RGB')
+
+            # Pillow counts every band in one C pass without copying
+            # pixels into a numpy array; alpha is dropped and grayscale
+            # feeds all three curves. Merge 256 levels into display bins
+            counts = np.array(img.histogram(), dtype=np.int64).reshape(-1, 256)[:3]
+            if len(counts) == 1:
+                counts = np.repeat(counts, 3, axis=0)
+            counts = counts.reshape(3, self.BIN_COUNT, -1).sum(axis=2)
+            
+        return counts / max(counts.max(), 1)
+        
+    def paintEvent(self, event):
+        """Draw frame, title, RGB curves and legend"""
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        
+        # Frame
+        rect = self.rect().adjusted(1, 1, -1, -1)
+        painter.setPen(QPen(QColor('#3c3c3c'), 2))
+        painter.setBrush(QColor('#1e1e1e'))
+        painter.drawRoundedRect(rect, 8, 8)
+        
+        font = QFont()
+        font.setPixelSize(12)
+        painter.setFont(font)
+        
+        if self.error_message:
+            painter.setPen(QColor('#ff6b6b'))
+            painter.drawText(rect, Qt.AlignCenter, self.error_message)
+            painter.end()
+            return
+            
+        if self.histograms is None:
+            painter.end()
+            return
+            
+        # Title
+        title_rect = rect.adjusted(8, 6, -8, 0)
+        title_rect.setHeight(18)
+        painter.setPen(QColor('#14a085'))
+        painter.drawText(title_rect, Qt.AlignHCenter | Qt.AlignVCenter, '🎨 RGB Color Histogram')
+        
+        # Plot area
+        plot = rect.adjusted(10, 30, -10, -10)
+        if plot.width() <= 0 or plot.height() <= 0:
+            painter.end()
+            return
+            
+        painter.setPen(QPen(QColor('#3c3c3c'), 1))
+        painter.drawLine(plot.bottomLeft(), plot.bottomRight())
+        
+        # Filled step curve per channel (top 15% kept free for the legend)
+        bin_width = plot.width() / self.BIN_COUNT
+        max_height = plot.height() * 0.85
+        painter.setPen(Qt.NoPen)
+        for (color, _), values in zip(self.CHANNEL_COLORS, self.histograms):
+            path = QPainterPath()
+            path.moveTo(plot.left(), plot.bottom())
+            for i, value in enumerate(values):
+                x = plot.left() + i * bin_width
+                y = plot.bottom() - value * max_height
+                path.lineTo(x, y)
+                path.lineTo(x + bin_width, y)
+            path.lineTo(plot.right(), plot.bottom())
+            path.closeSubpath()
+            painter.fillPath(path, color)
+            
+        # Legend
+        font.setPixelSize(9)
+        painter.setFont(font)
+        x = plot.right() - 3 * 48
+        for color, label in self.CHANNEL_COLORS:
+            painter.fillRect(x, plot.top() + 2, 8, 8, color)
+            painter.setPen(QColor('#e0e0e0'))
+            painter.drawText(x + 11, plot.top() + 10, label)
+            x += 48
+            
+        painter.end()
 
 
 class ImageViewer(QMainWindow):
     """High-performance ImageViewer Pro with beautiful interface"""
     
+    PREFETCH_OFFSETS = (1, -1, 2, -2)
+    PIXMAP_CACHE_SIZE = 5
+    PIXMAP_CACHE_LIMIT = 400 * 1024 * 1024  # bytes
+    
     def __init__(self):
         super().__init__()
         self.current_image_path = None
@@ -648,15 +1267,53 @@ class ImageViewer(QMainWindow):
         self.is_fullscreen = False
         self.dark_theme = True
         
+        # Only the image that stays on screen gets its side panels refreshed
+        self.metadata_timer = QTimer(self)
+        self.metadata_timer.setSingleShot(True)
+        self.metadata_timer.timeout.connect(lambda: self.load_metadata_async(self.current_image_path))
+        self.histogram_timer = QTimer(self)
+        self.histogram_timer.setSingleShot(True)
+        self.histogram_timer.timeout.connect(lambda: self.load_histogram_async(self.current_image_path))
+        
+        # Full-size decoding runs off the GUI thread; results from
+        # superseded navigations are dropped by generation
+        self.load_generation = 0
+        self.image_loader = ImageLoader()
+        self.image_loader.image_loaded.connect(self.on_image_loaded)
+        self.image_loader.preview_loaded.connect(self.on_preview_loaded)
+        self.pixmap_cache = OrderedDict()  # path -> decoded QPixmap, LRU order
+        
+        # Per-image status text is painted once navigation pauses
+        self.status_message = ""
+        self.status_timer = QTimer(self)
+        self.status_timer.setSingleShot(True)
+        self.status_timer.timeout.connect(lambda: self.status_bar.showMessage(self.status_message))
+        
         self.setup_ui()
         self.setup_menus()
         self.setup_shortcuts()
         self.apply_beautiful_theme()
         
+    def showEvent(self, event):
+        """Build the info panels right after the first paint"""
+        super().showEvent(event)
+        if self.metadata_widget is None:
+            QTimer.singleShot(0, self.ensure_info_panels)
+            
+    def ensure_info_panels(self):
+        """Create metadata and histogram widgets on first use"""
+        if self.metadata_widget is not None:
+            return
+        self.metadata_widget = BeautifulMetadataWidget()
+        self.metadata_layout.addWidget(self.metadata_widget)
+        self.histogram_widget = BeautifulHistogramWidget()
+        self.histogram_layout.addWidget(self.histogram_widget)
+        
     def closeEvent(self, event):
         """Handle app close with proper cleanup"""
         if hasattr(self, 'thumbnail_widget'):
             self.thumbnail_widget.cleanup()
+        self.image_loader.stop()
         event.accept()
         
     def setup_ui(self):
@@ -678,23 +1335,6 @@ class ImageViewer(QMainWindow):
         
         # Thumbnail browser with beautiful header
         thumbnail_group = QGroupBox("📁 Image Gallery")
-        thumbnail_group.setStyleSheet("""
-            QGroupBox {
-                font-weight: bold;
-                font-size: 12px;
-                color: #14a085;
-                border: 2px solid #3c3c3c;
-                border-radius: 8px;
-                margin-top: 8px;
-                padding-top: 12px;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 12px;
-                padding: 0 8px 0 8px;
-                background-color: #1e1e1e;
-            }
-        """)
         
         thumbnail_layout = QVBoxLayout(thumbnail_group)
         thumbnail_layout.setContentsMargins(8, 8, 8, 8)
@@ -714,39 +1354,13 @@ class ImageViewer(QMainWindow):
         
         # Image display with beautiful frame
         image_frame = QFrame()
-        image_frame.setStyleSheet("""
-            QFrame {
-                background-color: #1e1e1e;
-                border: 2px solid #3c3c3c;
-                border-radius: 8px;
-            }
-        """)
+        image_frame.setObjectName("imageFrame")
         
         image_layout = QVBoxLayout(image_frame)
         image_layout.setContentsMargins(4, 4, 4, 4)
         
         self.scroll_area = QScrollArea()
-        self.scroll_area.setStyleSheet("""
-            QScrollArea {
-                border: none;
-                background-color: transparent;
-            }
-            QScrollBar:vertical, QScrollBar:horizontal {
-                background-color: #2b2b2b;
-                border-radius: 6px;
-                width: 12px;
-                height: 12px;
-            }
-            QScrollBar::handle:vertical, QScrollBar::handle:horizontal {
-                background-color: #0d7377;
-                border-radius: 6px;
-                min-height: 20px;
-                min-width: 20px;
-            }
-            QScrollBar::handle:hover {
-                background-color: #14a085;
-            }
-        """)
+        self.scroll_area.setObjectName("imageScrollArea")
         
         self.image_label = ImageLabel()
         self.image_label.set_scroll_area(self.scroll_area)
@@ -758,61 +1372,34 @@ class ImageViewer(QMainWindow):
         
         # Beautiful control panel
         controls_frame = QFrame()
-        controls_frame.setStyleSheet("""
-            QFrame {
-                background-color: #2b2b2b;
-                border: 2px solid #3c3c3c;
-                border-radius: 8px;
-                padding: 4px;
-            }
-        """)
+        controls_frame.setObjectName("controlsFrame")
         
         controls_layout = QHBoxLayout(controls_frame)
         controls_layout.setSpacing(8)
         controls_layout.setContentsMargins(8, 4, 8, 4)
         
-        # Styled buttons
-        button_style = """
-            QPushButton {
-                background-color: #0d7377;
-                color: white;
-                border: 2px solid #14a085;
-                border-radius: 6px;
-                padding: 6px 12px;
-                font-weight: bold;
-                font-size: 11px;
-                min-width: 60px;
-            }
-            QPushButton:hover {
-                background-color: #14a085;
-                border: 2px solid #1bb299;
-            }            QPushButton:pressed {
-                background-color: #0a5a5d;
-            }
-        """
-        
         self.zoom_in_btn = QPushButton("🔍+ Zoom In")
-        self.zoom_in_btn.setStyleSheet(button_style)
+        self.zoom_in_btn.setObjectName("controlButton")
         self.zoom_in_btn.clicked.connect(self.image_label.zoom_in)
         
         self.zoom_out_btn = QPushButton("🔍- Zoom Out")
-        self.zoom_out_btn.setStyleSheet(button_style)
+        self.zoom_out_btn.setObjectName("controlButton")
         self.zoom_out_btn.clicked.connect(self.image_label.zoom_out)
         
         self.zoom_fit_btn = QPushButton("📐 Fit Window")
-        self.zoom_fit_btn.setStyleSheet(button_style)
+        self.zoom_fit_btn.setObjectName("controlButton")
         self.zoom_fit_btn.clicked.connect(self.image_label.zoom_fit)
         
         self.zoom_actual_btn = QPushButton("1:1 Actual Size")
-        self.zoom_actual_btn.setStyleSheet(button_style)
+        self.zoom_actual_btn.setObjectName("controlButton")
         self.zoom_actual_btn.clicked.connect(self.image_label.zoom_actual)
         
         self.rotate_left_btn = QPushButton("↺ Left")
-        self.rotate_left_btn.setStyleSheet(button_style)
+        self.rotate_left_btn.setObjectName("controlButton")
         self.rotate_left_btn.clicked.connect(self.image_label.rotate_left)
         
         self.rotate_right_btn = QPushButton("↻ Right")
-        self.rotate_right_btn.setStyleSheet(button_style)
+        self.rotate_right_btn.setObjectName("controlButton")
         self.rotate_right_btn.clicked.connect(self.image_label.rotate_right)
         
         controls_layout.addWidget(self.zoom_in_btn)
@@ -823,8 +1410,8 @@ class ImageViewer(QMainWindow):
         # Add separator frame
         separator = QFrame()
         separator.setFrameShape(QFrame.VLine)
-        separator.setFrameShadow(QFrame.Sunken)
-        separator.setStyleSheet("color: #3c3c3c;")
+        separator.setFrameShadow(QFrame.Plain)
+        separator.setObjectName("controlsSeparator")
         controls_layout.addWidget(separator)
         
         controls_layout.addWidget(self.rotate_left_btn)
@@ -844,57 +1431,22 @@ class ImageViewer(QMainWindow):
         
         # Metadata panel
         metadata_group = QGroupBox("📋 Image Information")
-        metadata_group.setStyleSheet("""
-            QGroupBox {
-                font-weight: bold;
-                font-size: 12px;
-                color: #14a085;
-                border: 2px solid #3c3c3c;
-                border-radius: 8px;
-                margin-top: 8px;
-                padding-top: 12px;
-            }            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 12px;
-                padding: 0 8px 0 8px;
-                background-color: #1e1e1e;
-            }
-        """)
-        
-        metadata_layout = QVBoxLayout(metadata_group)
-        metadata_layout.setContentsMargins(8, 8, 8, 8)
         
-        self.metadata_widget = BeautifulMetadataWidget()
-        metadata_layout.addWidget(self.metadata_widget)
+        self.metadata_layout = QVBoxLayout(metadata_group)
+        self.metadata_layout.setContentsMargins(8, 8, 8, 8)
         
         # Add metadata with expanded space (stretch factor of 3)
         right_layout.addWidget(metadata_group, 3)
         
         # Histogram panel positioned at bottom
         histogram_group = QGroupBox("📊 Color Analysis")
-        histogram_group.setStyleSheet("""
-            QGroupBox {
-                font-weight: bold;
-                font-size: 12px;
-                color: #14a085;
-                border: 2px solid #3c3c3c;
-                border-radius: 8px;
-                margin-top: 8px;
-                padding-top: 12px;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 12px;
-                padding: 0 8px 0 8px;
-                background-color: #1e1e1e;
-            }
-        """)
-        
-        histogram_layout = QVBoxLayout(histogram_group)
-        histogram_layout.setContentsMargins(8, 8, 8, 8)
         
-        self.histogram_widget = BeautifulHistogramWidget()
-        histogram_layout.addWidget(self.histogram_widget)
+        self.histogram_layout = QVBoxLayout(histogram_group)
+        self.histogram_layout.setContentsMargins(8, 8, 8, 8)
+        
+        # Panel contents are built after the window is first shown
+        self.metadata_widget = None
+        self.histogram_widget = None
         
         # Add histogram at bottom with fixed space (stretch factor of 1)
         right_layout.addWidget(histogram_group, 1)
@@ -914,15 +1466,6 @@ class ImageViewer(QMainWindow):
         
         # Beautiful status bar
         self.status_bar = self.statusBar()
-        self.status_bar.setStyleSheet("""
-            QStatusBar {
-                background-color: #2b2b2b;
-                color: #e0e0e0;
-                border-top: 2px solid #3c3c3c;
-                padding: 4px;
-                font-size: 11px;
-            }
-        """)
         self.status_bar.showMessage("🚀 ImageViewer Pro v2.1 Ready - Open an image or folder to start")
         
         # Window settings
@@ -933,161 +1476,69 @@ class ImageViewer(QMainWindow):
     def setup_menus(self):
         """Setup beautiful menus"""
         menubar = self.menuBar()
-        menubar.setStyleSheet("""
-            QMenuBar {
-                background-color: #2b2b2b;
-                color: #e0e0e0;
-                border-bottom: 2px solid #3c3c3c;
-                padding: 4px;
-            }
-            QMenuBar::item {
-                padding: 6px 12px;
-                margin: 2px;
-                border-radius: 4px;
-            }
-            QMenuBar::item:selected {
-                background-color: #0d7377;
-            }
-            QMenu {
-                background-color: #2b2b2b;
-                color: #e0e0e0;
-                border: 2px solid #3c3c3c;
-                border-radius: 6px;
-                padding: 4px;
-            }
-            QMenu::item {
-                padding: 8px 20px;
-                border-radius: 4px;
-            }
-            QMenu::item:selected {
-                background-color: #0d7377;
-            }
-        """)
-        
-        # File menu
-        file_menu = menubar.addMenu("📁 File")
-        
-        open_action = QAction("🖼️ Open Image", self)
-        open_action.setShortcut(QKeySequence.Open)
-        open_action.triggered.connect(self.open_image)
-        file_menu.addAction(open_action)
-        
-        open_folder_action = QAction("📂 Open Folder", self)
-        open_folder_action.setShortcut("Ctrl+Shift+O")
-        open_folder_action.triggered.connect(self.open_folder)
-        file_menu.addAction(open_folder_action)
-        
-        file_menu.addSeparator()
-        
-        exit_action = QAction("🚪 Exit", self)
-        exit_action.setShortcut(QKeySequence.Quit)
-        exit_action.triggered.connect(self.close)
-        file_menu.addAction(exit_action)
-          # View menu
-        view_menu = menubar.addMenu("👁️ View")
-        
-        fullscreen_action = QAction("🖥️ Fullscreen", self)
-        fullscreen_action.setShortcut("F11")
-        fullscreen_action.triggered.connect(self.toggle_fullscreen)
-        view_menu.addAction(fullscreen_action)
-        
-        theme_action = QAction("🎨 Toggle Theme", self)
-        theme_action.setShortcut("Ctrl+T")
-        theme_action.triggered.connect(self.toggle_theme)
-        view_menu.addAction(theme_action)
-        
-        view_menu.addSeparator()
-        
-        # Zoom actions
-        zoom_in_action = QAction("🔍+ Zoom In", self)
-        zoom_in_action.setShortcut("Ctrl++")
-        zoom_in_action.triggered.connect(self.image_label.zoom_in)
-        view_menu.addAction(zoom_in_action)
-        
-        zoom_out_action = QAction("🔍- Zoom Out", self)
-        zoom_out_action.setShortcut("Ctrl+-")
-        zoom_out_action.triggered.connect(self.image_label.zoom_out)
-        view_menu.addAction(zoom_out_action)
-        
-        zoom_fit_action = QAction("📐 Fit to Window", self)
-        zoom_fit_action.setShortcut("Ctrl+0")
-        zoom_fit_action.triggered.connect(self.image_label.zoom_fit)
-        view_menu.addAction(zoom_fit_action)
-        
-        zoom_actual_action = QAction("1️⃣ Actual Size", self)
-        zoom_actual_action.setShortcut("Ctrl+1")
-        zoom_actual_action.triggered.connect(self.image_label.zoom_actual)
-        view_menu.addAction(zoom_actual_action)
-        
-        # Transform menu
-        transform_menu = menubar.addMenu("🔄 Transform")
-        
-        rotate_left_action = QAction("↺ Rotate Left", self)
-        rotate_left_action.setShortcut("Ctrl+L")
-        rotate_left_action.triggered.connect(self.image_label.rotate_left)
-        transform_menu.addAction(rotate_left_action)
-        
-        rotate_right_action = QAction("↻ Rotate Right", self)
-        rotate_right_action.setShortcut("Ctrl+R")
-        rotate_right_action.triggered.connect(self.image_label.rotate_right)
-        transform_menu.addAction(rotate_right_action)
         
+        # (menu title, groups of (text, shortcut, slot)); groups are separated
+        menus = [
+            ("📁 File", [
+                [("🖼️ Open Image", QKeySequence.Open, self.open_image),
+                 ("📂 Open Folder", "Ctrl+Shift+O", self.open_folder)],
+                [("🚪 Exit", QKeySequence.Quit, self.close)],
+            ]),
+            ("👁️ View", [
+                [("🖥️ Fullscreen", "F11", self.toggle_fullscreen),
+                 ("🎨 Toggle Theme", "Ctrl+T", self.toggle_theme)],
+                [("🔍+ Zoom In", "Ctrl++", self.image_label.zoom_in),
+                 ("🔍- Zoom Out", "Ctrl+-", self.image_label.zoom_out),
+                 ("📐 Fit to Window", "Ctrl+0", self.image_label.zoom_fit),
+                 ("1️⃣ Actual Size", "Ctrl+1", self.image_label.zoom_actual)],
+            ]),
+            ("🔄 Transform", [
+                [("↺ Rotate Left", "Ctrl+L", self.image_label.rotate_left),
+                 ("↻ Rotate Right", "Ctrl+R", self.image_label.rotate_right)],
+            ]),
+        ]
+        
+        for title, groups in menus:
+            menu = menubar.addMenu(title)
+            for group_index, group in enumerate(groups):
+                if group_index:
+                    menu.addSeparator()
+                menu.addActions([self.create_action(shortcut, slot, text) for text, shortcut, slot in group])
+                
     def setup_shortcuts(self):
         """Setup keyboard shortcuts"""
-        # Navigation shortcuts
-        self.addAction(self.create_action("Left", self.previous_image))
-        self.addAction(self.create_action("Right", self.next_image))
-        self.addAction(self.create_action("Up", self.previous_image))    # Added up arrow navigation
-        self.addAction(self.create_action("Down", self.next_image))      # Added down arrow navigation
-        self.addAction(self.create_action("Space", self.next_image))
-        self.addAction(self.create_action("Backspace", self.previous_image))
-        
-    def create_action(self, shortcut, slot):
+        # Navigation shortcuts, including up/down arrows
+        navigation = [
+            ("Left", self.previous_image),
+            ("Right", self.next_image),
+            ("Up", self.previous_image),
+            ("Down", self.next_image),
+            ("Space", self.next_image),
+            ("Backspace", self.previous_image),
+        ]
+        self.addActions([self.create_action(shortcut, slot) for shortcut, slot in navigation])
+        
+    def create_action(self, shortcut, slot, text=""):
         """Helper to create action with shortcut"""
-        action = QAction(self)
+        action = QAction(text, self)
+        if isinstance(shortcut, str):
+            shortcut = SHORTCUTS.get(shortcut, shortcut)
         action.setShortcut(shortcut)
         action.triggered.connect(slot)
         return action
         
     def apply_beautiful_theme(self):
         """Apply beautiful dark theme"""
-        self.setStyleSheet("""
-            QMainWindow {
-                background-color: #1e1e1e;
-                color: #e0e0e0;
-            }
-            QWidget {
-                background-color: #1e1e1e;
-                color: #e0e0e0;
-                font-family: 'Segoe UI', Arial, sans-serif;
-            }
-            QSplitter::handle {
-                background-color: #3c3c3c;
-                width: 3px;
-                height: 3px;
-            }
-            QSplitter::handle:hover {
-                background-color: #0d7377;
-            }
-        """)
+        self.dark_palette = make_theme_palette(*DARK_THEME)
+        self.light_palette = make_theme_palette(*LIGHT_THEME)
+        self.setStyleSheet(APP_QSS)
+        self.setPalette(self.dark_palette)
         
     def toggle_theme(self):
         """Toggle between dark and light theme"""
         self.dark_theme = not self.dark_theme
-        if self.dark_theme:
-            self.apply_beautiful_theme()
-        else:
-            # Light theme
-            self.setStyleSheet("""
-                QMainWindow {
-                    background-color: #f5f5f5;
-                    color: #333333;
-                }
-                QWidget {
-                    background-color: #f5f5f5;
-                    color: #333333;
-                    font-family: 'Segoe UI', Arial, sans-serif;
-                }            """)
+        # Palette swap only - the stylesheet is left alone
+        self.setPalette(self.dark_palette if self.dark_theme else self.light_palette)
             
     def toggle_fullscreen(self):
         """Toggle fullscreen mode"""
@@ -1100,59 +1551,160 @@ class ImageViewer(QMainWindow):
     def open_image(self):
         """Open single image with beautiful dialog"""
         file_path, _ = QFileDialog.getOpenFileName(
-            self, "🖼️ Open Image File", "", 
-            "Images (*.jpg *.jpeg *.png *.bmp *.gif *.tiff *.webp *.ico *.arw *.cr2 *.cr3 *.nef *.dng *.raw *.orf *.pef *.rw2 *.srw *.x3f);;Standard Images (*.jpg *.jpeg *.png *.bmp *.gif *.tiff *.webp *.ico);;RAW Images (*.arw *.cr2 *.cr3 *.nef *.dng *.raw *.orf *.pef *.rw2 *.srw *.x3f);;All Files (*)"
+            self, "🖼️ Open Image File", "", FILE_DIALOG_FILTER
         )
         
         if file_path:
-            self.load_image(file_path)
-            # Load other images in same directory
-            directory = str(Path(file_path).parent)
-            self.thumbnail_widget.load_directory(directory)
+            self.open_path(file_path)
             
     def open_folder(self):
         """Open folder with beautiful dialog"""
         folder_path = QFileDialog.getExistingDirectory(self, "📂 Open Image Folder")
         
         if folder_path:
-            self.thumbnail_widget.load_directory(folder_path)
+            self.open_path(folder_path)
+            
+    def open_path(self, path: str):
+        """Show an image with its folder, or the first image of a folder"""
+        # Gallery paths are absolute; the current image must compare equal to them
+        path = os.path.abspath(path)
+        if os.path.isfile(path):
+            self.load_image(path)
+            # Load other images in same directory
+            self.load_directory(os.path.dirname(path))
+            self.select_path(path)
+            # A cached image was shown before its neighbours were known
+            if path in self.pixmap_cache:
+                self.prefetch_neighbours(path)
+        elif os.path.isdir(path):
+            self.load_directory(path)
             if self.thumbnail_widget.image_paths:
                 self.current_index = 0
                 self.thumbnail_widget.setCurrentRow(0)
                 self.load_image(self.thumbnail_widget.image_paths[0])
                 
+    def load_directory(self, directory: str):
+        """Show a folder in the gallery and drop cached panel results"""
+        # Keep only the image on screen; queued neighbours belong to the old folder
+        current_pixmap = self.pixmap_cache.get(self.current_image_path)
+        self.pixmap_cache.clear()
+        if current_pixmap is not None:
+            self.pixmap_cache[self.current_image_path] = current_pixmap
+        self.image_loader.prefetch([])
+        if self.metadata_widget is not None:
+            self.metadata_widget.clear_cache()
+            self.histogram_widget.clear_cache()
+            
+        # Insert all items with one layout pass and one repaint
+        self.thumbnail_widget.setUpdatesEnabled(False)
+        self.thumbnail_widget.blockSignals(True)
+        try:
+            self.thumbnail_widget.load_directory(directory)
+        finally:
+            self.thumbnail_widget.blockSignals(False)
+            self.thumbnail_widget.setUpdatesEnabled(True)
+            self.thumbnail_widget.viewport().update()
+        
     def load_image(self, image_path: str):
         """Load image with optimized performance and beautiful display"""
+        self.current_image_path = image_path
+        self.load_generation += 1
+        
+        # Async metadata and histogram loading, restarted on every
+        # navigation so held arrow keys don't queue up work
+        self.metadata_timer.start(150)
+        self.histogram_timer.start(200)
+        
+        # Neighbours decoded ahead of time display without waiting
+        pixmap = self.pixmap_cache.get(image_path)
+        if pixmap is not None:
+            self.pixmap_cache.move_to_end(image_path)
+            self.show_pixmap(image_path, pixmap)
+            return
+            
+        self.set_status(f"⏳ Loading {os.path.basename(image_path)}...")
+        self.image_loader.load(image_path, self.load_generation, self.scroll_area.viewport().size())
+        
+    def on_image_loaded(self, image_path: str, image: QImage, generation: int):
+        """Cache a decoded image and display it unless a newer one was requested"""
+        is_current = generation == self.load_generation and image_path == self.current_image_path
+        if not is_current and (generation != ImageLoader.PREFETCH or
+                               image_path not in self.get_neighbour_paths()):
+            return  # superseded - not worth a GUI-thread conversion or a cache slot
+            
+        if image.isNull():
+            if is_current:
+                self.metadata_timer.stop()
+                self.histogram_timer.stop()
+                self.set_status(f"❌ Failed to load: {os.path.basename(image_path)}")
+            return
+            
+        # Pixmaps may only be created on the GUI thread
+        pixmap = QPixmap.fromImage(image)
+        self.cache_pixmap(image_path, pixmap)
+        if is_current:
+            self.show_pixmap(image_path, pixmap)
+            
+    def on_preview_loaded(self, image_path: str, image: QImage, generation: int):
+        """Show a reduced decode fitted to the window until the full image arrives"""
+        if generation != self.load_generation or image_path in self.pixmap_cache:
+            return
+        self.image_label.set_image(QPixmap.fromImage(image), fit=True)
+            
+    def set_status(self, message: str):
+        """Show a status message, coalescing bursts of updates into one repaint"""
+        self.status_message = message
+        self.status_timer.start(30)
+        
+    def cache_pixmap(self, image_path: str, pixmap: QPixmap):
+        """Keep recently decoded images within the count and memory limits"""
+        self.pixmap_cache[image_path] = pixmap
+        self.pixmap_cache.move_to_end(image_path)
+        
+        total = sum(p.width() * p.height() * p.depth() // 8 for p in self.pixmap_cache.values())
+        while len(self.pixmap_cache) > 1 and (
+                len(self.pixmap_cache) > self.PIXMAP_CACHE_SIZE or total > self.PIXMAP_CACHE_LIMIT):
+            _, evicted = self.pixmap_cache.popitem(last=False)
+            total -= evicted.width() * evicted.height() * evicted.depth() // 8
+            
+    def get_neighbour_paths(self) -> List[str]:
+        """Images around the current one, nearest first"""
+        image_paths = self.thumbnail_widget.image_paths
+        index = self.current_index
+        return [image_paths[index + offset] for offset in self.PREFETCH_OFFSETS
+                if 0 <= index + offset < len(image_paths)]
+        
+    def prefetch_neighbours(self, image_path: str):
+        """Decode the images around the current one in the background"""
+        image_paths = self.thumbnail_widget.image_paths
+        index = self.current_index
+        if not (0 <= index < len(image_paths)) or image_paths[index] != image_path:
+            return
+            
+        neighbours = [path for path in self.get_neighbour_paths() if path not in self.pixmap_cache]
+        self.image_loader.prefetch(neighbours)
+        
+    def show_pixmap(self, image_path: str, pixmap: QPixmap):
+        """Display a decoded image"""
         try:
-            # Fast pixmap loading
-            pixmap = QPixmap(image_path)
-            if pixmap.isNull():
-                self.status_bar.showMessage(f"❌ Failed to load: {os.path.basename(image_path)}")
-                return
-                
-            # Immediate display
-            self.image_label.set_image(pixmap)
-            self.current_image_path = image_path
-            self.image_label.zoom_fit()
+            filename = os.path.basename(image_path)
+            self.image_label.set_image(pixmap, fit=True)
             
             # Beautiful status update
-            filename = os.path.basename(image_path)
-            self.status_bar.showMessage(
+            self.set_status(
                 f"🖼️ {filename} • 📏 {pixmap.width()}×{pixmap.height()} • 🔍 {int(self.image_label.scale_factor*100)}%"
             )
             self.setWindowTitle(f"🖼️ ImageViewer Pro v2.1 - {filename}")
-            
-            # Async metadata and histogram loading for performance
-            QTimer.singleShot(50, lambda: self.load_metadata_async(image_path))
-            QTimer.singleShot(100, lambda: self.load_histogram_async(image_path))
+            self.prefetch_neighbours(image_path)
             
         except Exception as e:
-            self.status_bar.showMessage(f"❌ Error loading image: {str(e)}")
+            self.set_status(f"❌ Error loading image: {str(e)}")
             
     def load_metadata_async(self, image_path: str):
         """Load metadata asynchronously"""
         if self.current_image_path == image_path:
             try:
+                self.ensure_info_panels()
                 self.metadata_widget.display_metadata(image_path)
             except Exception:
                 pass
@@ -1161,16 +1713,26 @@ class ImageViewer(QMainWindow):
         """Load histogram asynchronously"""
         if self.current_image_path == image_path:
             try:
+                self.ensure_info_panels()
                 self.histogram_widget.set_image(image_path)
             except Exception:
                 pass
                 
     def on_thumbnail_clicked(self, item):
         """Handle thumbnail click with smooth transition"""
-        row = self.thumbnail_widget.row(item)
-        if 0 <= row < len(self.thumbnail_widget.image_paths):
+        # Path stored on the item - no row() scan over the whole list
+        image_path = item.data(Qt.UserRole)
+        row = self.thumbnail_widget.index_by_path.get(image_path)
+        if row is not None:
             self.current_index = row
-            self.load_image(self.thumbnail_widget.image_paths[row])
+            self.load_image(image_path)
+            
+    def select_path(self, image_path: str):
+        """Make navigation continue from an image opened outside the gallery"""
+        row = self.thumbnail_widget.index_by_path.get(image_path)
+        if row is not None:
+            self.current_index = row
+            self.thumbnail_widget.setCurrentRow(row)
             
     def previous_image(self):
         """Navigate to previous image"""
@@ -1190,6 +1752,17 @@ class ImageViewer(QMainWindow):
 
 def main():
     """Main application function with error handling"""
+    parser = argparse.ArgumentParser(prog="ImageViewer Pro",
+                                     description="Fast image viewer with RAW support")
+    parser.add_argument("path", nargs="?", help="image file or folder to open")
+    parser.add_argument("--version", action="version", version="%(prog)s 2.1")
+    # Qt's own options stay in sys.argv for QApplication
+    args, _ = parser.parse_known_args(strip_qt_options(sys.argv[1:]))
+    
+    # Answer --help, --version and bad paths before paying for Qt start-up
+    if args.path is not None and not os.path.exists(args.path):
+        parser.error(f"no such file or directory: {args.path}")
+    
     app = QApplication(sys.argv)
     app.setApplicationName("ImageViewer Pro")
     app.setApplicationVersion("2.1")
@@ -1200,17 +1773,16 @@ def main():
         viewer = ImageViewer()
         viewer.show()
         
-        # Handle command line arguments
-        if len(sys.argv) > 1:
-            path = sys.argv[1]
-            if os.path.isfile(path):
-                viewer.load_image(path)
-                directory = str(Path(path).parent)
-                viewer.thumbnail_widget.load_directory(directory)
-            elif os.path.isdir(path):
-                viewer.thumbnail_widget.load_directory(path)
-                if viewer.thumbnail_widget.image_paths:
-                    viewer.load_image(viewer.thumbnail_widget.image_paths[0])
+        # Widgets built so far live for the whole session; keep them out
+        # of the collector's generations so collections stay cheap
+        gc.freeze()
+        
+        # Warm the module cache once the first frames are out
+        QTimer.singleShot(50, lambda: threading.Thread(target=prewarm_modules, daemon=True).start())
+        
+        # Handle command line arguments once the window has been painted
+        if args.path is not None:
+            QTimer.singleShot(0, lambda: viewer.open_path(args.path))
         
         # Start event loop
         sys.exit(app.exec_())
@@ -25,7 +25,6 @@ def install_requirements():
         try:
             import PyQt5
             import PIL
-            import matplotlib
             import numpy
             print("✅ All imports successful!")
             
@@ -6,24 +6,28 @@ Tests the RAW format support, navigation, and layout improvements
 
 import sys
 import os
+from pathlib import Path
 from PyQt5.QtWidgets import QApplication
 from PyQt5.QtCore import QTimer
 
 def test_raw_format_support():
     """Test that RAW formats are supported in file dialog"""
     try:
-        from main import ImageViewer
+        from main import ImageViewer, FILE_DIALOG_FILTER
         
         print("🔍 Testing RAW format support...")
         
-        # Check if open_image method contains RAW formats
+        # Check that open_image uses the shared filter and it contains RAW formats
         import inspect
         source = inspect.getsource(ImageViewer.open_image)
+        if 'FILE_DIALOG_FILTER' not in source:
+            print("❌ open_image does not use FILE_DIALOG_FILTER")
+            return False
         
         raw_formats = ['.arw', '.cr2', '.cr3', '.nef', '.dng', '.raw', '.orf', '.pef', '.rw2', '.srw', '.x3f']
         
         for fmt in raw_formats:
-            if fmt in source:
+            if fmt in FILE_DIALOG_FILTER:
                 print(f"✅ RAW format {fmt} found in file dialog")
             else:
                 print(f"❌ RAW format {fmt} NOT found")
@@ -88,18 +92,15 @@ def test_layout_improvements():
 def test_thumbnail_raw_support():
     """Test that thumbnail widget supports RAW formats"""
     try:
-        from main import BeautifulThumbnailWidget
+        from main import SUPPORTED_FORMATS
         
         print("\n🔍 Testing thumbnail RAW support...")
         
-        # Check if load_directory method contains RAW formats
-        import inspect
-        source = inspect.getsource(BeautifulThumbnailWidget.load_directory)
-        
+        # Check that the gallery's extension set contains RAW formats
         raw_formats = ['.arw', '.cr2', '.cr3', '.nef', '.dng', '.raw', '.orf', '.pef', '.rw2', '.srw', '.x3f']
         
         for fmt in raw_formats:
-            if fmt in source:
+            if fmt in SUPPORTED_FORMATS:
                 print(f"✅ Thumbnail RAW format {fmt} found")
             else:
                 print(f"❌ Thumbnail RAW format {fmt} NOT found")
@@ -112,6 +113,448 @@ def test_thumbnail_raw_support():
         print(f"❌ Thumbnail RAW test failed: {e}")
         return False
 
+def test_thumbnail_disk_cache():
+    """Test that thumbnails are written to and served from the disk cache"""
+    try:
+        import tempfile
+        import main
+        from PIL import Image
+        
+        print("\n🔍 Testing thumbnail disk cache...")
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            original_cache_dir = main.THUMBNAIL_CACHE_DIR
+            main.THUMBNAIL_CACHE_DIR = Path(temp_dir) / "thumbs"
+            try:
+                image_path = os.path.join(temp_dir, "sample.png")
+                Image.new('RGB', (640, 480), (200, 100, 50)).save(image_path)
+                
+                worker = main.ThumbnailWorker()
+                first = worker.create_thumbnail(image_path)
+                cache_path = worker.get_cache_path(image_path, os.stat(image_path))
+                
+                if first is None or not cache_path.exists():
+                    print("❌ Thumbnail was not written to the disk cache")
+                    return False
+                print("✅ Thumbnail written to disk cache")
+                
+                second = worker.create_thumbnail(image_path)
+                if second is None or second.size() != first.size():
+                    print("❌ Cached thumbnail could not be reused")
+                    return False
+                print("✅ Cached thumbnail reused")
+            finally:
+                main.THUMBNAIL_CACHE_DIR = original_cache_dir
+        
+        print("🎉 Thumbnail disk cache test passed!")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Thumbnail disk cache test failed: {e}")
+        return False
+
+def test_thumbnail_cache_trim():
+    """Test that trimming removes the least recently used thumbnails first"""
+    try:
+        import tempfile
+        import time
+        import main
+        
+        print("\n🔍 Testing thumbnail cache trimming...")
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            original_cache_dir = main.THUMBNAIL_CACHE_DIR
+            main.THUMBNAIL_CACHE_DIR = Path(temp_dir)
+            try:
+                sub_dir = Path(temp_dir) / "ab"
+                sub_dir.mkdir()
+                now = time.time()
+                for i in range(4):
+                    path = sub_dir / f"{i}.jpg"
+                    path.write_bytes(b"x" * 1000)
+                    os.utime(path, (now, now - 100 + i))  # 0.jpg used longest ago
+                
+                remaining = main.trim_thumbnail_cache(limit=2500)
+                names = sorted(path.name for path in sub_dir.iterdir())
+            finally:
+                main.THUMBNAIL_CACHE_DIR = original_cache_dir
+        
+        if names != ["2.jpg", "3.jpg"]:
+            print(f"❌ Unexpected thumbnails kept: {names}")
+            return False
+        if remaining != 2000:
+            print(f"❌ Unexpected remaining size: {remaining}")
+            return False
+        print("✅ Oldest thumbnails by mtime removed, down to 90% of the limit")
+        
+        print("🎉 Thumbnail cache trimming test passed!")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Thumbnail cache trimming test failed: {e}")
+        return False
+
+def test_histogram_large_image():
+    """Test that histograms are generated for images above the 1MP sampling limit"""
+    try:
+        import tempfile
+        from PIL import Image
+        
+        print("\n🔍 Testing histogram for large images...")
+        
+        app = QApplication.instance()
+        if app is None:
+            app = QApplication(sys.argv)
+        
+        from main import BeautifulHistogramWidget
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            image_path = os.path.join(temp_dir, "large.png")
+            Image.new('RGB', (1600, 1200), (255, 0, 0)).save(image_path)
+            
+            widget = BeautifulHistogramWidget()
+            widget.set_image(image_path)
+        
+        if widget.error_message or widget.histograms is None:
+            print(f"❌ Histogram not generated: {widget.error_message}")
+            return False
+        print("✅ Histogram generated for 1.9MP image")
+        
+        # Pure red: all red pixels in the top bin, green/blue in the bottom bin
+        if widget.histograms[0][-1] != 1.0 or widget.histograms[1][0] != 1.0:
+            print("❌ Histogram bins do not match image content")
+            return False
+        print("✅ Histogram bins match image content")
+        
+        print("🎉 Large image histogram test passed!")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Large image histogram test failed: {e}")
+        return False
+
+def test_info_panel_debounce():
+    """Test that rapid navigation only refreshes the side panels once"""
+    try:
+        import tempfile
+        import time
+        from PIL import Image
+        
+        print("\n🔍 Testing side panel debounce...")
+        
+        app = QApplication.instance()
+        if app is None:
+            app = QApplication(sys.argv)
+        
+        import main
+        from main import ImageViewer
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            # Keep thumbnails generated for the gallery out of the real cache
+            original_cache_dir = main.THUMBNAIL_CACHE_DIR
+            main.THUMBNAIL_CACHE_DIR = Path(temp_dir) / "thumbs"
+            viewer = None
+            try:
+                for i in range(5):
+                    Image.new('RGB', (64, 48), (i * 50, 0, 0)).save(os.path.join(temp_dir, f"img{i}.png"))
+                
+                viewer = ImageViewer()
+                viewer.ensure_info_panels()
+                viewer.load_directory(temp_dir)
+                viewer.load_image(viewer.thumbnail_widget.image_paths[0])
+                
+                computed = []
+                original = viewer.histogram_widget.compute_histograms
+                viewer.histogram_widget.compute_histograms = lambda path: computed.append(path) or original(path)
+                
+                def settle():
+                    deadline = time.time() + 0.5
+                    while time.time() < deadline:
+                        app.processEvents()
+                        time.sleep(0.01)
+                
+                # Hold the arrow key: only the last image is analysed
+                for _ in range(4):
+                    viewer.next_image()
+                settle()
+                last_path = viewer.thumbnail_widget.image_paths[4]
+                if computed != [last_path]:
+                    print(f"❌ Expected one histogram for the last image, got {len(computed)}")
+                    return False
+                print("✅ Histogram computed once after rapid navigation")
+                
+                # Revisiting an unchanged image reuses the cached result
+                viewer.load_image(last_path)
+                settle()
+                if len(computed) != 1:
+                    print("❌ Cached histogram was recomputed")
+                    return False
+                print("✅ Revisited image served from cache")
+            finally:
+                if viewer is not None:
+                    viewer.thumbnail_widget.cleanup()
+                main.THUMBNAIL_CACHE_DIR = original_cache_dir
+        
+        print("🎉 Side panel debounce test passed!")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Side panel debounce test failed: {e}")
+        return False
+
+def test_async_image_loading():
+    """Test that images decode in the background and stale loads are dropped"""
+    try:
+        import tempfile
+        import time
+        from PIL import Image
+        
+        print("\n🔍 Testing background image loading...")
+        
+        app = QApplication.instance()
+        if app is None:
+            app = QApplication(sys.argv)
+        
+        from main import ImageViewer
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            first_path = os.path.join(temp_dir, "first.png")
+            second_path = os.path.join(temp_dir, "second.png")
+            Image.new('RGB', (300, 200), (255, 0, 0)).save(first_path)
+            Image.new('RGB', (40, 30), (0, 0, 255)).save(second_path)
+            
+            viewer = ImageViewer()
+            viewer.load_image(first_path)
+            viewer.load_image(second_path)
+            
+            deadline = time.time() + 5
+            while viewer.image_label.original_pixmap is None and time.time() < deadline:
+                app.processEvents()
+                time.sleep(0.01)
+            # Let the superseded decode arrive as well
+            for _ in range(20):
+                app.processEvents()
+                time.sleep(0.01)
+            viewer.image_loader.stop()
+        
+        pixmap = viewer.image_label.original_pixmap
+        if pixmap is None:
+            print("❌ Image was never displayed")
+            return False
+        if (pixmap.width(), pixmap.height()) != (40, 30):
+            print(f"❌ Stale image displayed: {pixmap.width()}×{pixmap.height()}")
+            return False
+        print("✅ Only the latest requested image is displayed")
+        
+        print("🎉 Background image loading test passed!")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Background image loading test failed: {e}")
+        return False
+
+def test_neighbour_prefetch():
+    """Test that neighbouring images are decoded ahead of navigation"""
+    try:
+        import tempfile
+        import time
+        from PIL import Image
+        
+        print("\n🔍 Testing neighbour prefetch...")
+        
+        app = QApplication.instance()
+        if app is None:
+            app = QApplication(sys.argv)
+        
+        import main
+        from main import ImageViewer
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            # Keep thumbnails generated for the gallery out of the real cache
+            original_cache_dir = main.THUMBNAIL_CACHE_DIR
+            main.THUMBNAIL_CACHE_DIR = Path(temp_dir) / "thumbs"
+            viewer = None
+            try:
+                for i in range(6):
+                    Image.new('RGB', (60 + i, 40), (i * 40, 0, 0)).save(os.path.join(temp_dir, f"img{i}.png"))
+                
+                viewer = ImageViewer()
+                viewer.load_directory(temp_dir)
+                image_paths = viewer.thumbnail_widget.image_paths
+                viewer.current_index = 2
+                viewer.load_image(image_paths[2])
+                
+                deadline = time.time() + 5
+                while len(viewer.pixmap_cache) < 5 and time.time() < deadline:
+                    app.processEvents()
+                    time.sleep(0.01)
+                
+                if set(viewer.pixmap_cache) != set(image_paths[0:5]):
+                    print(f"❌ Unexpected prefetched images: {sorted(os.path.basename(p) for p in viewer.pixmap_cache)}")
+                    return False
+                print("✅ Two images on each side prefetched")
+                
+                # The next image is shown without waiting for a decode
+                viewer.next_image()
+                pixmap = viewer.image_label.original_pixmap
+                if pixmap is None or pixmap.width() != 63:
+                    print("❌ Next image was not served from the prefetch cache")
+                    return False
+                print("✅ Next image displayed immediately")
+                
+                # A relative path, as given on the command line, prefetches too
+                cwd = os.getcwd()
+                os.chdir(temp_dir)
+                try:
+                    viewer.open_path("img0.png")
+                finally:
+                    os.chdir(cwd)
+                deadline = time.time() + 5
+                while len(viewer.pixmap_cache) < 3 and time.time() < deadline:
+                    app.processEvents()
+                    time.sleep(0.01)
+                if set(viewer.pixmap_cache) != set(viewer.thumbnail_widget.image_paths[0:3]):
+                    print("❌ Image opened by relative path did not prefetch its neighbours")
+                    return False
+                print("✅ Relative path resolved before prefetching")
+            finally:
+                if viewer is not None:
+                    viewer.thumbnail_widget.cleanup()
+                    viewer.image_loader.stop()
+                main.THUMBNAIL_CACHE_DIR = original_cache_dir
+        
+        print("🎉 Neighbour prefetch test passed!")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Neighbour prefetch test failed: {e}")
+        return False
+
+def test_stale_loads_dropped():
+    """Test that superseded loads are cancelled and their results ignored"""
+    try:
+        import threading
+        from unittest import mock
+        from PyQt5.QtGui import QImage, QPixmap
+        
+        print("\n🔍 Testing stale load handling...")
+        
+        app = QApplication.instance()
+        if app is None:
+            app = QApplication(sys.argv)
+        
+        from main import ImageLoader, ImageViewer
+        
+        # Occupy both decoder threads so queued loads stay pending
+        loader = ImageLoader()
+        release = threading.Event()
+        for _ in range(2):
+            loader.executor.submit(release.wait)
+        try:
+            loader.load("first.jpg", 1)
+            superseded = list(loader.load_futures)
+            loader.load("second.jpg", 2)
+        finally:
+            release.set()
+            loader.stop()
+        
+        if not superseded or not all(future.cancelled() for future in superseded):
+            print("❌ Superseded load was not cancelled")
+            return False
+        print("✅ Superseded load cancelled before decoding")
+        
+        # A result for an older navigation is neither converted nor cached
+        viewer = ImageViewer()
+        viewer.load_generation = 2
+        viewer.current_image_path = "second.jpg"
+        image = QImage(40, 30, QImage.Format_RGB32)
+        with mock.patch.object(QPixmap, 'fromImage') as from_image:
+            viewer.on_image_loaded("first.jpg", image, 1)
+            # So is a prefetch for an image that is no longer a neighbour
+            viewer.on_image_loaded("elsewhere.jpg", image, ImageLoader.PREFETCH)
+        viewer.image_loader.stop()
+        
+        if from_image.call_count:
+            print("❌ Stale result was converted to a pixmap")
+            return False
+        if viewer.pixmap_cache or viewer.image_label.original_pixmap is not None:
+            print("❌ Stale result was cached or displayed")
+            return False
+        print("✅ Stale result dropped without conversion")
+        
+        print("🎉 Stale load handling test passed!")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Stale load handling test failed: {e}")
+        return False
+
+def test_jpeg_preview():
+    """Test that a large JPEG is shown from a reduced decode before the full one"""
+    try:
+        import tempfile
+        from PIL import Image
+        from PyQt5.QtCore import QSize
+        
+        print("\n🔍 Testing reduced JPEG preview...")
+        
+        app = QApplication.instance()
+        if app is None:
+            app = QApplication(sys.argv)
+        
+        from main import ImageLoader
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            jpeg_path = os.path.join(temp_dir, "large.jpg")
+            png_path = os.path.join(temp_dir, "large.png")
+            Image.new('RGB', (3000, 2000), (0, 128, 255)).save(jpeg_path, quality=85)
+            Image.new('RGB', (3000, 2000), (0, 128, 255)).save(png_path)
+            
+            loader = ImageLoader()
+            previews = []
+            loader.preview_loaded.connect(lambda path, image, gen: previews.append((path, image)))
+            loader.decode_preview(jpeg_path, 1, QSize(600, 400))
+            loader.decode_preview(png_path, 1, QSize(600, 400))
+            loader.stop()
+        
+        if len(previews) != 1 or previews[0][0] != jpeg_path:
+            print(f"❌ Expected one JPEG preview, got {len(previews)}")
+            return False
+        image = previews[0][1]
+        if (image.width(), image.height()) != (600, 400):
+            print(f"❌ Preview has wrong size: {image.width()}×{image.height()}")
+            return False
+        print("✅ JPEG previewed at window size, other formats skipped")
+        
+        print("🎉 Reduced JPEG preview test passed!")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Reduced JPEG preview test failed: {e}")
+        return False
+
+def test_command_line_qt_options():
+    """Test that Qt's own options and their values are not taken as the path"""
+    try:
+        from main import strip_qt_options
+        
+        print("\n🔍 Testing command line Qt options...")
+        
+        argv = ["-style", "fusion", "--platform", "offscreen", "-reverse",
+                "-qwindowgeometry", "800x600", "-style=fusion", "photo.jpg"]
+        remaining = strip_qt_options(argv)
+        if remaining != ["-reverse", "-style=fusion", "photo.jpg"]:
+            print(f"❌ Unexpected arguments left: {remaining}")
+            return False
+        print("✅ Qt option values not mistaken for the image path")
+        
+        print("🎉 Command line Qt options test passed!")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Command line Qt options test failed: {e}")
+        return False
+
 def test_app_instantiation():
     """Test that the application can be instantiated without errors"""
     try:
@@ -155,6 +598,15 @@ def main():
         test_navigation_shortcuts,
         test_layout_improvements,
         test_thumbnail_raw_support,
+        test_thumbnail_disk_cache,
+        test_thumbnail_cache_trim,
+        test_histogram_large_image,
+        test_info_panel_debounce,
+        test_async_image_loading,
+        test_neighbour_prefetch,
+        test_stale_loads_dropped,
+        test_jpeg_preview,
+        test_command_line_qt_options,
         test_app_instantiation
     ]
     